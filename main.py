@@ -10,6 +10,7 @@ This CLI interface provides comprehensive capabilities for:
 """
 
 import argparse
+import logging
 import os
 import sys
 from pathlib import Path
@@ -20,19 +21,200 @@ project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 from nba.config import get_settings
-from nba.db.session import create_all_tables, get_session_factory
-from nba.ingest.teams_ingest import ingest_teams
-from nba.ingest.games_ingest import ingest_games
-from nba.ingest.players_ingest import ingest_players
-from nba.ingest.stats_ingest import ingest_team_stats, ingest_player_stats
+from nba.db.session import (
+    check_schema, create_all_tables, get_session_factory, max_concurrent_sessions, schema_mismatches
+)
+
+
+OUTPUT_DIRECTORIES = ("data", "models", "analysis", "visualizations")
+
+_dirs_ready = False
 
 
 def ensure_directories() -> None:
-    """Ensure necessary directories exist."""
-    Path("data").mkdir(exist_ok=True)
-    Path("models").mkdir(exist_ok=True)
-    Path("analysis").mkdir(exist_ok=True)
-    Path("visualizations").mkdir(exist_ok=True)
+    """Ensure necessary directories exist (once per process)."""
+    global _dirs_ready
+    if _dirs_ready:
+        return
+    for directory in OUTPUT_DIRECTORIES:
+        Path(directory).mkdir(exist_ok=True)
+    _dirs_ready = True
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for options that need an integer of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _cmd_init_db(args: argparse.Namespace) -> None:
+    """Initialize database tables."""
+    if args.recreate:
+        print("Dropping and recreating database tables...")
+    else:
+        print("Initializing database tables...")
+    create_all_tables(recreate=args.recreate)
+    print("Database tables created successfully!")
+    
+    # create_all leaves existing tables alone, so report any that are outdated
+    mismatches = schema_mismatches()
+    if mismatches:
+        print("Existing tables use an older schema; ingest commands will refuse to run:")
+        for mismatch in mismatches:
+            print(f"  - {mismatch}")
+        print("Back up the data and run 'python main.py init-db --recreate' to rebuild them.")
+
+
+def _cmd_ingest_teams(args: argparse.Namespace) -> None:
+    """Ingest team information."""
+    ensure_directories()
+    from nba.ingest.teams_ingest import ingest_teams
+    print("Ingesting teams...")
+    ingest_teams()
+
+
+def _cmd_ingest_games(args: argparse.Namespace) -> None:
+    """Ingest game data for a season."""
+    ensure_directories()
+    from nba.ingest.games_ingest import ingest_games
+    print(f"Ingesting games for {args.season} {args.season_type}...")
+    ingest_games(args.season, args.season_type)
+
+
+def _cmd_ingest_players(args: argparse.Namespace) -> None:
+    """Ingest player data."""
+    ensure_directories()
+    from nba.ingest.players_ingest import ingest_players
+    print("Ingesting players...")
+    ingest_players(args.season, args.team_id)
+
+
+def _cmd_ingest_team_stats(args: argparse.Namespace) -> None:
+    """Ingest team statistics for a season."""
+    ensure_directories()
+    from nba.ingest.stats_ingest import ingest_team_stats
+    print(f"Ingesting team stats for {args.season} {args.season_type}...")
+    ingest_team_stats(args.season, args.season_type, return_count=True)
+
+
+def _cmd_ingest_player_stats(args: argparse.Namespace) -> None:
+    """Ingest player statistics for a season."""
+    ensure_directories()
+    from nba.ingest.stats_ingest import ingest_player_stats
+    print(f"Ingesting player stats for {args.season} {args.season_type}...")
+    ingest_player_stats(args.season, args.season_type, args.team_id, return_count=True)
+
+
+def _run_parallel(tasks: list, workers: int) -> None:
+    """
+    Run ingestion tasks on a thread pool.
+    
+    The work is dominated by blocking NBA API calls, so threads overlap the
+    waits. Tasks don't share a session: every ingest call opens its own
+    session and commits its own transaction. Workers are capped at the
+    number of connections the database pool can hand out.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    
+    max_workers = min(workers, len(tasks))
+    max_sessions = max_concurrent_sessions()
+    if max_sessions is not None and max_workers > max_sessions:
+        print(f"Limiting workers to {max_sessions}, the database connection pool size")
+        max_workers = max_sessions
+    print(f"Running {len(tasks)} ingestion tasks on {max_workers} workers...")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(func, *func_args) for func, func_args in tasks]
+        for future in as_completed(futures):
+            # Re-raise the first failure
+            future.result()
+
+
+def _cmd_ingest_historical(args: argparse.Namespace) -> None:
+    """Ingest historical data over a range of years."""
+    ensure_directories()
+    end_year = args.end_year or args.start_year
+    
+    # Only import the ingest modules for the requested data types
+    if "teams" in args.data_types:
+        from nba.ingest.teams_ingest import ingest_teams
+    if "games" in args.data_types:
+        from nba.ingest.games_ingest import ingest_games
+    if "players" in args.data_types:
+        from nba.ingest.players_ingest import ingest_players
+    if "team_stats" in args.data_types:
+        from nba.ingest.stats_ingest import ingest_team_stats
+    if "player_stats" in args.data_types:
+        from nba.ingest.stats_ingest import ingest_player_stats
+    both_stats = "team_stats" in args.data_types and "player_stats" in args.data_types
+    if both_stats:
+        from nba.ingest.stats_ingest import ingest_season
+    
+    print(f"Ingesting historical data from {args.start_year} to {end_year}...")
+    
+    if args.workers > 1:
+        # Team data doesn't vary by season, so fetch it once before fanning out
+        if "teams" in args.data_types:
+            print("Ingesting teams (once)...")
+            ingest_teams()
+        
+        tasks = []
+        for year in range(args.start_year, end_year + 1):
+            if "games" in args.data_types:
+                tasks.append((ingest_games, (year, args.season_type)))
+            if "players" in args.data_types:
+                tasks.append((ingest_players, (year,)))
+            if both_stats:
+                # Team and player stats for a season commit together
+                tasks.append((ingest_season, (year, args.season_type)))
+            elif "team_stats" in args.data_types:
+                tasks.append((ingest_team_stats, (year, args.season_type)))
+            elif "player_stats" in args.data_types:
+                tasks.append((ingest_player_stats, (year, args.season_type)))
+        
+        if tasks:
+            _run_parallel(tasks, args.workers)
+    else:
+        # One session and one transaction for the whole year range
+        session_factory = get_session_factory()
+        with session_factory() as session, session.begin():
+            # Team data doesn't vary by season, so fetch it once for the whole range
+            if "teams" in args.data_types:
+                print("Ingesting teams (once)...")
+                ingest_teams(session=session)
+            
+            for year in range(args.start_year, end_year + 1):
+                print(f"\nProcessing year {year}...")
+                
+                if "games" in args.data_types:
+                    print(f"  Ingesting games for {year} {args.season_type}...")
+                    ingest_games(year, args.season_type, session=session)
+                
+                if "players" in args.data_types:
+                    print(f"  Ingesting players for {year}...")
+                    ingest_players(year, session=session)
+                
+                if "team_stats" in args.data_types:
+                    print(f"  Ingesting team stats for {year} {args.season_type}...")
+                    ingest_team_stats(year, args.season_type, session=session, return_count=True)
+                
+                if "player_stats" in args.data_types:
+                    print(f"  Ingesting player stats for {year} {args.season_type}...")
+                    ingest_player_stats(year, args.season_type, session=session, return_count=True)
+    
+    print(f"\nHistorical data ingestion completed for {args.start_year}-{end_year}")
+
+
+def _cmd_analyze(args: argparse.Namespace) -> None:
+    """Run analysis."""
+    ensure_directories()
+    print(f"Running {args.analysis_type} analysis...")
+    # TODO: Implement analysis functions
+    print("Analysis functionality coming soon!")
 
 
 def cli() -> None:
@@ -44,33 +226,38 @@ def cli() -> None:
     
     # Teams ingestion
     p_teams = subparsers.add_parser("ingest-teams", help="Ingest team information")
+    p_teams.set_defaults(func=_cmd_ingest_teams)
     
     # Games ingestion
     p_games = subparsers.add_parser("ingest-games", help="Ingest game data")
     p_games.add_argument("--season", type=int, required=True, help="NBA season year (e.g., 2023 for 2023-24)")
     p_games.add_argument("--season-type", type=str, default="Regular Season", 
-                        choices=["Regular Season", "Playoffs", "All-Star"],
+                        choices=["Regular Season", "Playoffs", "All Star"],
                         help="Season type")
+    p_games.set_defaults(func=_cmd_ingest_games)
     
     # Players ingestion
     p_players = subparsers.add_parser("ingest-players", help="Ingest player data")
     p_players.add_argument("--season", type=int, help="NBA season year")
     p_players.add_argument("--team-id", type=str, help="Specific team ID to ingest players for")
+    p_players.set_defaults(func=_cmd_ingest_players)
     
     # Team stats ingestion
     p_team_stats = subparsers.add_parser("ingest-team-stats", help="Ingest team statistics")
     p_team_stats.add_argument("--season", type=int, required=True, help="NBA season year")
     p_team_stats.add_argument("--season-type", type=str, default="Regular Season",
-                             choices=["Regular Season", "Playoffs", "All-Star"],
+                             choices=["Regular Season", "Playoffs", "All Star"],
                              help="Season type")
+    p_team_stats.set_defaults(func=_cmd_ingest_team_stats)
     
     # Player stats ingestion
     p_player_stats = subparsers.add_parser("ingest-player-stats", help="Ingest player statistics")
     p_player_stats.add_argument("--season", type=int, required=True, help="NBA season year")
     p_player_stats.add_argument("--season-type", type=str, default="Regular Season",
-                               choices=["Regular Season", "Playoffs", "All-Star"],
+                               choices=["Regular Season", "Playoffs", "All Star"],
                                help="Season type")
     p_player_stats.add_argument("--team-id", type=str, help="Specific team ID to ingest stats for")
+    p_player_stats.set_defaults(func=_cmd_ingest_player_stats)
     
     # Historical data ingestion
     p_historical = subparsers.add_parser("ingest-historical", help="Ingest historical data")
@@ -81,12 +268,21 @@ def cli() -> None:
                              default=["teams", "games", "team_stats"],
                              help="Types of data to ingest")
     p_historical.add_argument("--season-type", type=str, default="Regular Season",
-                             choices=["Regular Season", "Playoffs", "All-Star"],
+                             choices=["Regular Season", "Playoffs", "All Star"],
                              help="Season type for games and stats")
+    p_historical.add_argument("--workers", type=_positive_int, default=1,
+                             help="Parallel ingestion workers (at least 1, at most the "
+                                  "database connection pool size); values above 1 ingest "
+                                  "each year/data type in its own transaction")
+    p_historical.set_defaults(func=_cmd_ingest_historical)
 
     # ===== DATABASE COMMANDS =====
     
     p_db = subparsers.add_parser("init-db", help="Initialize database tables")
+    p_db.add_argument("--recreate", action="store_true",
+                      help="Drop every table, and all stored data, before creating them; "
+                           "use this to upgrade a database created with an older schema")
+    p_db.set_defaults(func=_cmd_init_db)
     
     # ===== ANALYSIS COMMANDS =====
     
@@ -96,72 +292,18 @@ def cli() -> None:
                           choices=["team_performance", "player_performance", "game_trends"],
                           default="team_performance",
                           help="Type of analysis to run")
+    p_analyze.set_defaults(func=_cmd_analyze)
 
-    # Parse arguments
+    # Parse arguments and dispatch to the selected command's handler
     args = parser.parse_args()
-
-    # Ensure directories exist
-    ensure_directories()
-
-    # Execute commands
-    if args.command == "init-db":
-        print("Initializing database tables...")
-        create_all_tables()
-        print("Database tables created successfully!")
-        
-    elif args.command == "ingest-teams":
-        print("Ingesting teams...")
-        ingest_teams()
-        
-    elif args.command == "ingest-games":
-        print(f"Ingesting games for {args.season} {args.season_type}...")
-        ingest_games(args.season, args.season_type)
-        
-    elif args.command == "ingest-players":
-        print("Ingesting players...")
-        ingest_players(args.season, args.team_id)
-        
-    elif args.command == "ingest-team-stats":
-        print(f"Ingesting team stats for {args.season} {args.season_type}...")
-        ingest_team_stats(args.season, args.season_type)
-        
-    elif args.command == "ingest-player-stats":
-        print(f"Ingesting player stats for {args.season} {args.season_type}...")
-        ingest_player_stats(args.season, args.season_type, args.team_id)
-        
-    elif args.command == "ingest-historical":
-        end_year = args.end_year or args.start_year
-        print(f"Ingesting historical data from {args.start_year} to {end_year}...")
-        
-        for year in range(args.start_year, end_year + 1):
-            print(f"\nProcessing year {year}...")
-            
-            if "teams" in args.data_types:
-                print("  Ingesting teams...")
-                ingest_teams()
-                
-            if "games" in args.data_types:
-                print(f"  Ingesting games for {year} {args.season_type}...")
-                ingest_games(year, args.season_type)
-                
-            if "players" in args.data_types:
-                print(f"  Ingesting players for {year}...")
-                ingest_players(year)
-                
-            if "team_stats" in args.data_types:
-                print(f"  Ingesting team stats for {year} {args.season_type}...")
-                ingest_team_stats(year, args.season_type)
-                
-            if "player_stats" in args.data_types:
-                print(f"  Ingesting player stats for {year} {args.season_type}...")
-                ingest_player_stats(year, args.season_type)
-        
-        print(f"\nHistorical data ingestion completed for {args.start_year}-{end_year}")
-        
-    elif args.command == "analyze":
-        print(f"Running {args.analysis_type} analysis...")
-        # TODO: Implement analysis functions
-        print("Analysis functionality coming soon!")
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    if args.command.startswith("ingest-"):
+        # Fail before any API calls rather than writing into an outdated schema
+        try:
+            check_schema()
+        except RuntimeError as e:
+            sys.exit(f"Error: {e}")
+    args.func(args)
 
 
 if __name__ == "__main__":
@@ -1,11 +1,20 @@
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 from dotenv import load_dotenv
 
 
-load_dotenv(override=False)
+_env_loaded = False
+
+
+def load_env() -> None:
+    """Load variables from .env once per process."""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv(override=False)
+        _env_loaded = True
 
 
 @dataclass(frozen=True)
@@ -14,7 +23,9 @@ class Settings:
     database_url: str
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
+    load_env()
     api_key = os.getenv("NBA_API_KEY")
     db_url = os.getenv("DATABASE_URL")
     if not db_url:
@@ -2,10 +2,34 @@
 Database models and session management for NBA data
 """
 
-from .models import *
-from .session import get_session_factory, create_all_tables
+from .session import get_session_factory, create_all_tables, check_schema
+
+# Models are imported on first access so CLI paths that never touch the ORM
+# don't pay for building the declarative metadata.
+_LAZY_MODELS = {
+    "Base",
+    "Team",
+    "Game",
+    "Player",
+    "TeamStats",
+    "TeamSeasonSummary",
+    "GameStats",
+    "PlayerGameStats",
+    "PlayerSeasonStats",
+    "BettingLine",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_MODELS:
+        from . import models
+        return getattr(models, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "get_session_factory",
-    "create_all_tables"
+    "create_all_tables",
+    "check_schema",
+    *sorted(_LAZY_MODELS),
 ]
@@ -0,0 +1,187 @@
+"""
+Bulk write helpers for NBA data
+"""
+
+import io
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import bindparam, column, func, or_, select, table as table_clause, text, tuple_
+from sqlalchemy.orm import Session
+
+
+# psycopg2 upserts at least this large are staged with COPY instead of a
+# multi-row INSERT
+COPY_MIN_ROWS = 1000
+
+
+def batched(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield successive lists of at most ``size`` items."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def upsert_rows(session: Session, model, rows: List[Dict[str, Any]],
+                index_elements: Sequence[str],
+                update_columns: Optional[Iterable[str]] = None, *,
+                keep_existing_on_null: bool = False,
+                skip_unchanged: bool = False) -> None:
+    """
+    Insert rows, updating the existing row when a unique key already exists.
+    
+    On SQLite and PostgreSQL this runs as a single executemany
+    INSERT ... ON CONFLICT DO UPDATE statement. On psycopg2 batches of at
+    least COPY_MIN_ROWS rows are first streamed into a temporary table with
+    COPY and upserted from there in one INSERT ... SELECT. Other dialects
+    fall back to one IN query for the existing keys followed by a bulk INSERT
+    and a bulk UPDATE by primary key.
+    
+    Args:
+        session: Database session
+        model: Mapped class whose table receives the rows
+        rows: Column-name keyed dicts; every dict must have the same keys
+        index_elements: Columns of the unique constraint to resolve conflicts on
+        update_columns: Columns to overwrite on conflict. Defaults to every
+            column present in the rows except the conflict columns.
+        keep_existing_on_null: Keep the stored value when the incoming value
+            is NULL instead of overwriting it.
+        skip_unchanged: Only rewrite existing rows whose update columns
+            would actually change, so unchanged rows cost no write.
+    """
+    if not rows:
+        return
+    
+    if update_columns is None:
+        update_columns = [key for key in rows[0] if key not in index_elements]
+    else:
+        update_columns = list(update_columns)
+    
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        _upsert_rows_prefetch(session, model, rows, index_elements, update_columns,
+                              keep_existing_on_null, skip_unchanged)
+        return
+    
+    table = model.__table__
+    stmt = insert(table)
+    
+    staged = None
+    if (dialect == "postgresql" and len(rows) >= COPY_MIN_ROWS
+            and session.get_bind().dialect.driver == "psycopg2"):
+        staged = _copy_to_temp_table(session, table, rows)
+        stmt = stmt.from_select(staged.columns.keys(), select(staged))
+    
+    if keep_existing_on_null:
+        set_ = {name: func.coalesce(stmt.excluded[name], table.c[name]) for name in update_columns}
+    else:
+        set_ = {name: stmt.excluded[name] for name in update_columns}
+    where = _changed_condition(table, set_) if skip_unchanged else None
+    stmt = stmt.on_conflict_do_update(index_elements=list(index_elements), set_=set_, where=where)
+    
+    if staged is None:
+        session.execute(stmt, rows)
+    else:
+        session.execute(stmt)
+        session.execute(text(f"DROP TABLE {staged.name}"))
+
+
+def _copy_to_temp_table(session: Session, table, rows: List[Dict[str, Any]]):
+    """COPY rows into a temporary copy of ``table``'s columns and return it."""
+    names = list(rows[0])
+    staging_name = f"_stage_{table.name}"
+    
+    session.execute(text(f"DROP TABLE IF EXISTS {staging_name}"))
+    session.execute(text(
+        f"CREATE TEMPORARY TABLE {staging_name} AS "
+        f"SELECT {', '.join(names)} FROM {table.name} WITH NO DATA"
+    ))
+    
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_text(row[name]) for name in names))
+        buffer.write("\n")
+    buffer.seek(0)
+    
+    # Raw DBAPI cursor on the session's own connection, so the COPY joins
+    # the current transaction
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {staging_name} ({', '.join(names)}) FROM STDIN", buffer)
+    finally:
+        cursor.close()
+    
+    return table_clause(staging_name, *(column(name) for name in names))
+
+
+def _copy_text(value: Any) -> str:
+    """Encode one value for COPY's text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _upsert_rows_prefetch(session: Session, model, rows: List[Dict[str, Any]],
+                          index_elements: Sequence[str],
+                          update_columns: List[str],
+                          keep_existing_on_null: bool = False,
+                          skip_unchanged: bool = False) -> None:
+    """Upsert by prefetching existing keys and splitting into INSERT/UPDATE batches."""
+    table = model.__table__
+    pk_col = list(table.primary_key.columns)[0]
+    key_cols = [table.c[name] for name in index_elements]
+    
+    # One IN query for every incoming key instead of a lookup per row
+    keys = {tuple(row[name] for name in index_elements) for row in rows}
+    if len(key_cols) == 1:
+        condition = key_cols[0].in_([key[0] for key in keys])
+    else:
+        condition = tuple_(*key_cols).in_(list(keys))
+    existing = {
+        tuple(result[1:]): result[0]
+        for result in session.execute(select(pk_col, *key_cols).where(condition))
+    }
+    
+    to_insert = []
+    to_update = []
+    for row in rows:
+        pk = existing.get(tuple(row[name] for name in index_elements))
+        if pk is None:
+            to_insert.append(row)
+        elif update_columns:
+            params = {f"b_{name}": row[name] for name in update_columns}
+            params["b_pk"] = pk
+            to_update.append(params)
+    
+    if to_insert:
+        session.execute(table.insert(), to_insert)
+    if to_update:
+        values = {
+            name: func.coalesce(bindparam(f"b_{name}"), table.c[name])
+            if keep_existing_on_null else bindparam(f"b_{name}")
+            for name in update_columns
+        }
+        stmt = table.update().where(pk_col == bindparam("b_pk")).values(values)
+        if skip_unchanged:
+            stmt = stmt.where(_changed_condition(table, values))
+        session.execute(stmt, to_update)
+
+
+def _changed_condition(table, new_values: Dict[str, Any]):
+    """NULL-safe 'any column differs' condition for a conditional UPDATE."""
+    return or_(*(table.c[name].is_distinct_from(value) for name, value in new_values.items()))
@@ -11,7 +11,7 @@ from datetime import datetime
 from typing import Optional
 
 from sqlalchemy import (
-    Boolean, DateTime, ForeignKey, Integer, String, Float, 
+    Boolean, Computed, DateTime, Enum, ForeignKey, Integer, SmallInteger, String, Float, 
     Index, UniqueConstraint, Text, Column, Date
 )
 from sqlalchemy.orm import relationship
@@ -19,6 +19,26 @@ from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
 
+SEASON_TYPES = ("Regular Season", "Playoffs", "Pre Season", "All Star", "PlayIn")
+
+# Shared so PostgreSQL creates a single season_type_enum type
+SeasonType = Enum(*SEASON_TYPES, name="season_type_enum")
+
+# Box-score efficiency ratios derived from the counting stats; stored as
+# generated columns so the database keeps them in sync with the counters.
+TRUE_SHOOTING_SQL = (
+    "CASE WHEN (field_goals_attempted + 0.44 * free_throws_attempted) > 0 "
+    "THEN points / (2.0 * (field_goals_attempted + 0.44 * free_throws_attempted)) END"
+)
+EFFECTIVE_FG_SQL = (
+    "CASE WHEN field_goals_attempted > 0 "
+    "THEN (field_goals_made + 0.5 * three_points_made) / (1.0 * field_goals_attempted) END"
+)
+
+# Relationships use lazy="raise_on_sql": touching an unloaded relationship
+# raises instead of silently emitting a query per row. Load them explicitly
+# with selectinload()/joinedload() where needed.
+
 
 class Team(Base):
     __tablename__ = "teams"
@@ -29,25 +49,20 @@ class Team(Base):
     abbreviation = Column(String(8), unique=True, index=True)
     city = Column(String(64), nullable=True)
     state = Column(String(32), nullable=True)
-    conference = Column(String(32), nullable=True, index=True)
-    division = Column(String(32), nullable=True, index=True)
+    conference = Column(String(16), nullable=True, index=True)
+    division = Column(String(16), nullable=True, index=True)
     arena = Column(String(128), nullable=True)
-    arena_capacity = Column(Integer, nullable=True)
-    founded = Column(Integer, nullable=True)
+    arena_capacity = Column(SmallInteger, nullable=True)
+    founded = Column(SmallInteger, nullable=True)
     primary_color = Column(String(32), nullable=True)
     secondary_color = Column(String(32), nullable=True)
     logo_url = Column(String(256), nullable=True)
     
     # Relationships
-    team_stats = relationship("TeamStats", back_populates="team")
-    home_games = relationship("Game", foreign_keys="Game.home_team_id")
-    away_games = relationship("Game", foreign_keys="Game.away_team_id")
-    players = relationship("Player", back_populates="team")
-
-    __table_args__ = (
-        Index("ix_teams_conference", "conference"),
-        Index("ix_teams_division", "division"),
-    )
+    team_stats = relationship("TeamStats", back_populates="team", lazy="raise_on_sql")
+    home_games = relationship("Game", foreign_keys="Game.home_team_id", lazy="raise_on_sql")
+    away_games = relationship("Game", foreign_keys="Game.away_team_id", lazy="raise_on_sql")
+    players = relationship("Player", back_populates="team", lazy="raise_on_sql")
 
     def __repr__(self) -> str:
         return f"Team(id={self.id}, name={self.name}, abbreviation={self.abbreviation})"
@@ -58,8 +73,8 @@ class Game(Base):
 
     id = Column(Integer, primary_key=True)  # NBA game_id
     game_date = Column(Date, index=True)
-    season = Column(Integer, index=True)
-    season_type = Column(String(16), index=True)  # Regular Season, Playoffs, etc.
+    season = Column(SmallInteger, index=True)
+    season_type = Column(SeasonType, index=True)  # Regular Season, Playoffs, etc.
     game_type = Column(String(16), nullable=True)  # Regular, Playoff, All-Star, etc.
     
     # Team references
@@ -69,9 +84,10 @@ class Game(Base):
     away_team_abbr = Column(String(8), index=True)
     
     # Game results
-    home_score = Column(Integer, nullable=True)
-    away_score = Column(Integer, nullable=True)
-    home_win = Column(Boolean, nullable=True)
+    home_score = Column(SmallInteger, nullable=True)
+    away_score = Column(SmallInteger, nullable=True)
+    # NULL until both scores are known
+    home_win = Column(Boolean, Computed("home_score > away_score", persisted=True), nullable=True)
     
     # Game metadata
     arena = Column(String(128), nullable=True)
@@ -87,16 +103,16 @@ class Game(Base):
     away_back_to_back = Column(Boolean, default=False)
     
     # Relationships
-    game_stats = relationship("GameStats", back_populates="game", cascade="all, delete-orphan")
-    player_stats = relationship("PlayerGameStats", back_populates="game", cascade="all, delete-orphan")
-    betting_lines = relationship("BettingLine", back_populates="game", cascade="all, delete-orphan")
+    game_stats = relationship("GameStats", back_populates="game", cascade="all, delete-orphan", lazy="raise_on_sql")
+    player_stats = relationship("PlayerGameStats", back_populates="game", cascade="all, delete-orphan", lazy="raise_on_sql")
+    betting_lines = relationship("BettingLine", back_populates="game", cascade="all, delete-orphan", lazy="raise_on_sql")
 
     __table_args__ = (
-        Index("ix_games_season_date", "season", "game_date"),
-        Index("ix_games_home_team_id", "home_team_id"),
-        Index("ix_games_away_team_id", "away_team_id"),
-        Index("ix_games_home_team_abbr", "home_team_abbr"),
-        Index("ix_games_away_team_abbr", "away_team_abbr"),
+        # Covers get_games_by_season's (season, season_type) filter, in date order
+        Index("ix_games_season_type_date", "season", "season_type", "game_date"),
+        # Matchup queries filter by season plus home or away team
+        Index("ix_games_season_home_abbr", "season", "home_team_abbr"),
+        Index("ix_games_season_away_abbr", "season", "away_team_abbr"),
     )
 
     def __repr__(self) -> str:
@@ -116,26 +132,30 @@ class Player(Base):
     # Player details
     position = Column(String(8), nullable=True, index=True)
     height = Column(String(16), nullable=True)
-    weight = Column(Integer, nullable=True)  # in pounds
+    weight = Column(SmallInteger, nullable=True)  # in pounds
     birth_date = Column(Date, nullable=True)
     birth_place = Column(String(128), nullable=True)
     college = Column(String(128), nullable=True)
-    draft_year = Column(Integer, nullable=True)
-    draft_round = Column(Integer, nullable=True)
-    draft_number = Column(Integer, nullable=True)
+    draft_year = Column(SmallInteger, nullable=True)
+    draft_round = Column(SmallInteger, nullable=True)
+    draft_number = Column(SmallInteger, nullable=True)
     
     # Status
     is_active = Column(Boolean, default=True, index=True)
     jersey_number = Column(String(8), nullable=True)
     
     # Relationships
-    team = relationship("Team", back_populates="players")
-    game_stats = relationship("PlayerGameStats", back_populates="player", cascade="all, delete-orphan")
-    season_stats = relationship("PlayerSeasonStats", back_populates="player", cascade="all, delete-orphan")
+    team = relationship("Team", back_populates="players", lazy="raise_on_sql")
+    game_stats = relationship("PlayerGameStats", back_populates="player", cascade="all, delete-orphan", lazy="raise_on_sql")
+    season_stats = relationship("PlayerSeasonStats", back_populates="player", cascade="all, delete-orphan", lazy="raise_on_sql")
 
     __table_args__ = (
-        Index("ix_players_position", "position"),
-        Index("ix_players_is_active", "is_active"),
+        # Partial index matching the is_active == True filter of the roster read helpers
+        Index(
+            "ix_players_active_team", "team_id",
+            sqlite_where=is_active == True,
+            postgresql_where=is_active == True,
+        ),
     )
 
     def __repr__(self) -> str:
@@ -147,8 +167,8 @@ class TeamStats(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     team_id = Column(ForeignKey("teams.id"), nullable=False, index=True)
-    season = Column(Integer, index=True)
-    season_type = Column(String(16), index=True)
+    season = Column(SmallInteger, index=True)
+    season_type = Column(SeasonType, index=True)
     
     # Basic stats
     games_played = Column(Integer, default=0)
@@ -178,17 +198,49 @@ class TeamStats(Base):
     net_rating = Column(Float, nullable=True)
     
     # Relationships
-    team = relationship("Team", back_populates="team_stats")
+    team = relationship("Team", back_populates="team_stats", lazy="raise_on_sql")
 
     __table_args__ = (
-        Index("ix_team_stats_team_season", "team_id", "season"),
-        Index("ix_team_stats_season_type", "season", "season_type"),
+        # One row per team and season; also the conflict target for the
+        # stats upsert and a prefix index for (team_id, season) lookups
+        UniqueConstraint("team_id", "season", "season_type", name="uq_team_stats_team_season_type"),
+        Index("ix_team_stats_season_season_type", "season", "season_type"),
     )
 
     def __repr__(self) -> str:
         return f"TeamStats(team_id={self.team_id}, season={self.season}, wins={self.wins}-{self.losses})"
 
 
+class TeamSeasonSummary(Base):
+    """Per-team season roll-up of game results, rebuilt from games at ingest time."""
+    __tablename__ = "team_season_summary"
+
+    team_id = Column(ForeignKey("teams.id"), primary_key=True)
+    season = Column(SmallInteger, primary_key=True)
+    season_type = Column(SeasonType, primary_key=True)
+    
+    # Record
+    games_played = Column(SmallInteger, nullable=False, default=0)
+    wins = Column(SmallInteger, nullable=False, default=0)
+    losses = Column(SmallInteger, nullable=False, default=0)
+    home_wins = Column(SmallInteger, nullable=False, default=0)
+    away_wins = Column(SmallInteger, nullable=False, default=0)
+    
+    # Scoring
+    points_per_game = Column(Float, nullable=True)
+    opponent_points_per_game = Column(Float, nullable=True)
+    
+    # Relationships
+    team = relationship("Team", lazy="raise_on_sql")
+
+    __table_args__ = (
+        Index("ix_team_season_summary_season_season_type", "season", "season_type"),
+    )
+
+    def __repr__(self) -> str:
+        return f"TeamSeasonSummary(team_id={self.team_id}, season={self.season}, wins={self.wins}-{self.losses})"
+
+
 class GameStats(Base):
     __tablename__ = "game_stats"
 
@@ -222,15 +274,15 @@ class GameStats(Base):
     personal_fouls = Column(Integer, default=0)
     
     # Advanced stats
-    true_shooting_percentage = Column(Float, nullable=True)
-    effective_field_goal_percentage = Column(Float, nullable=True)
+    true_shooting_percentage = Column(Float, Computed(TRUE_SHOOTING_SQL, persisted=True))
+    effective_field_goal_percentage = Column(Float, Computed(EFFECTIVE_FG_SQL, persisted=True))
     offensive_rebound_percentage = Column(Float, nullable=True)
     defensive_rebound_percentage = Column(Float, nullable=True)
     assist_percentage = Column(Float, nullable=True)
     turnover_percentage = Column(Float, nullable=True)
     
     # Relationships
-    game = relationship("Game", back_populates="game_stats")
+    game = relationship("Game", back_populates="game_stats", lazy="raise_on_sql")
 
     __table_args__ = (
         Index("ix_game_stats_game_team", "game_id", "team_id"),
@@ -250,7 +302,6 @@ class PlayerGameStats(Base):
     
     # Game context
     started = Column(Boolean, default=False)
-    minutes_played = Column(String(8), nullable=True)  # "MM:SS" format
     minutes_played_seconds = Column(Integer, nullable=True)
     
     # Basic stats
@@ -279,21 +330,37 @@ class PlayerGameStats(Base):
     
     # Advanced stats
     plus_minus = Column(Integer, nullable=True)
-    true_shooting_percentage = Column(Float, nullable=True)
-    effective_field_goal_percentage = Column(Float, nullable=True)
+    true_shooting_percentage = Column(Float, Computed(TRUE_SHOOTING_SQL, persisted=True))
+    effective_field_goal_percentage = Column(Float, Computed(EFFECTIVE_FG_SQL, persisted=True))
     offensive_rebound_percentage = Column(Float, nullable=True)
     defensive_rebound_percentage = Column(Float, nullable=True)
     assist_percentage = Column(Float, nullable=True)
     turnover_percentage = Column(Float, nullable=True)
     
     # Relationships
-    game = relationship("Game", back_populates="player_stats")
-    player = relationship("Player", back_populates="game_stats")
+    game = relationship("Game", back_populates="player_stats", lazy="raise_on_sql")
+    player = relationship("Player", back_populates="game_stats", lazy="raise_on_sql")
 
     __table_args__ = (
         Index("ix_player_game_stats_game_player", "game_id", "player_id"),
     )
 
+    @property
+    def minutes_played(self) -> Optional[str]:
+        """Minutes played in "MM:SS" format, derived from minutes_played_seconds."""
+        if self.minutes_played_seconds is None:
+            return None
+        minutes, seconds = divmod(self.minutes_played_seconds, 60)
+        return f"{minutes}:{seconds:02d}"
+
+    @minutes_played.setter
+    def minutes_played(self, value: Optional[str]) -> None:
+        if not value:
+            self.minutes_played_seconds = None
+            return
+        minutes, _, seconds = value.partition(":")
+        self.minutes_played_seconds = int(minutes) * 60 + int(seconds or 0)
+
     def __repr__(self) -> str:
         return f"PlayerGameStats(game_id={self.game_id}, player_id={self.player_id}, points={self.points})"
 
@@ -304,8 +371,8 @@ class PlayerSeasonStats(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     player_id = Column(ForeignKey("players.id"), nullable=False, index=True)
     team_id = Column(ForeignKey("teams.id"), nullable=False, index=True)
-    season = Column(Integer, index=True)
-    season_type = Column(String(16), index=True)
+    season = Column(SmallInteger, index=True)
+    season_type = Column(SeasonType, index=True)
     
     # Games played
     games_played = Column(Integer, default=0)
@@ -340,11 +407,16 @@ class PlayerSeasonStats(Base):
     player_efficiency_rating = Column(Float, nullable=True)
     
     # Relationships
-    player = relationship("Player", back_populates="season_stats")
+    player = relationship("Player", back_populates="season_stats", lazy="raise_on_sql")
 
     __table_args__ = (
-        Index("ix_player_season_stats_player_season", "player_id", "season"),
-        Index("ix_player_season_stats_season_type", "season", "season_type"),
+        # One row per player and season; also the conflict target for the
+        # stats upsert and a prefix index for (player_id, season) lookups
+        UniqueConstraint(
+            "player_id", "season", "season_type",
+            name="uq_player_season_stats_player_season_type"
+        ),
+        Index("ix_player_season_stats_season_season_type", "season", "season_type"),
     )
 
     def __repr__(self) -> str:
@@ -376,7 +448,7 @@ class BettingLine(Base):
     timestamp = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    game = relationship("Game", back_populates="betting_lines")
+    game = relationship("Game", back_populates="betting_lines", lazy="raise_on_sql")
 
     __table_args__ = (
         Index("ix_betting_lines_game", "game_id"),
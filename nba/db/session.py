@@ -2,44 +2,189 @@
 Database session management for NBA data
 """
 
-from sqlalchemy import create_engine
+from functools import lru_cache
+from typing import List, Optional
+
+from sqlalchemy import UniqueConstraint, create_engine, event, inspect
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
 
 from nba.config import get_settings
-from .models import Base
 
 
-def get_session_factory() -> sessionmaker:
-    """Get SQLAlchemy session factory."""
+# Applied to every new SQLite connection; WAL + synchronous=NORMAL avoids an
+# fsync per commit on the insert-heavy ingest paths, and a ~200 MB page cache
+# keeps season-sized working sets in memory.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-200000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Connections kept for a file-backed SQLite database. Each parallel ingest
+# worker holds one session, so this is also the most useful --workers value.
+SQLITE_POOL_SIZE = 8
+SQLITE_MAX_OVERFLOW = 0
+
+# Extra connections a server database's pool may open beyond pool_size
+# (SQLAlchemy's default, passed explicitly so max_concurrent_sessions knows it)
+SERVER_MAX_OVERFLOW = 10
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Configure a freshly opened SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+@lru_cache(maxsize=1)
+def _get_engine() -> Engine:
+    """Get the process-wide SQLAlchemy engine for the configured database."""
     settings = get_settings()
     
     # Configure engine with appropriate settings for SQLite
     if "sqlite" in settings.database_url:
+        url = make_url(settings.database_url)
+        # An in-memory database only exists on its one connection; file
+        # databases get a checked-out connection per session, so parallel
+        # ingest workers never share a connection or a transaction
+        in_memory = url.database in (None, "", ":memory:")
+        if in_memory:
+            pool_args = {"poolclass": StaticPool}
+        else:
+            pool_args = {
+                "poolclass": QueuePool,
+                "pool_size": SQLITE_POOL_SIZE,
+                "max_overflow": SQLITE_MAX_OVERFLOW,
+            }
         engine = create_engine(
             settings.database_url,
             connect_args={"check_same_thread": False},
-            poolclass=StaticPool,
+            echo=False,
+            **pool_args
+        )
+    elif make_url(settings.database_url).get_dialect().driver == "psycopg2":
+        # Batch executemany() into multi-row VALUES (INSERT) and
+        # execute_batch pages (UPDATE) instead of one round-trip per row
+        engine = create_engine(
+            settings.database_url,
+            executemany_mode="values_plus_batch",
+            executemany_batch_page_size=500,
+            max_overflow=SERVER_MAX_OVERFLOW,
             echo=False
         )
     else:
-        engine = create_engine(settings.database_url, echo=False)
+        engine = create_engine(settings.database_url, max_overflow=SERVER_MAX_OVERFLOW, echo=False)
+    
+    if engine.url.get_backend_name() == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
     
-    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    return engine
 
 
-def create_all_tables() -> None:
-    """Create all database tables."""
-    settings = get_settings()
+def schema_mismatches() -> List[str]:
+    """
+    Compare the database's existing tables against the models.
     
-    if "sqlite" in settings.database_url:
-        engine = create_engine(
-            settings.database_url,
-            connect_args={"check_same_thread": False},
-            poolclass=StaticPool,
-            echo=False
+    Only tables that already exist are checked; missing ones are left for
+    create_all_tables. The checks cover what create_all cannot fix in
+    place: missing columns, generated columns stored as plain ones, and
+    missing unique keys that upserts use as their conflict target.
+    
+    Returns:
+        One description per mismatch, empty when the schema is current.
+    """
+    from .models import Base
+    
+    inspector = inspect(_get_engine())
+    existing = set(inspector.get_table_names())
+    mismatches = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        
+        columns = {column["name"]: column for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            reflected = columns.get(column.name)
+            if reflected is None:
+                mismatches.append(f"{table.name}.{column.name} is missing")
+            elif column.computed is not None and "computed" not in reflected:
+                mismatches.append(f"{table.name}.{column.name} is not a generated column")
+        
+        unique_keys = {
+            tuple(constraint["column_names"])
+            for constraint in inspector.get_unique_constraints(table.name)
+        }
+        unique_keys.update(
+            tuple(index["column_names"])
+            for index in inspector.get_indexes(table.name) if index["unique"]
         )
-    else:
-        engine = create_engine(settings.database_url, echo=False)
+        for constraint in table.constraints:
+            if isinstance(constraint, UniqueConstraint):
+                key = tuple(column.name for column in constraint.columns)
+                if key not in unique_keys:
+                    mismatches.append(f"{table.name} has no unique key on ({', '.join(key)})")
+    
+    return mismatches
+
+
+def check_schema() -> None:
+    """
+    Refuse to write to a database created from an older schema.
+    
+    Raises:
+        RuntimeError: If schema_mismatches() finds any difference.
+    """
+    mismatches = schema_mismatches()
+    if mismatches:
+        raise RuntimeError(
+            f"The database was created with an older schema ({'; '.join(mismatches)}). "
+            "There are no migrations: back it up, run "
+            "'python main.py init-db --recreate' (drops all tables) and re-ingest."
+        )
+
+
+def max_concurrent_sessions() -> Optional[int]:
+    """
+    Number of sessions that can hold a database connection at the same time.
+    
+    Returns:
+        The engine pool's connection limit, or None when it is unbounded.
+    """
+    engine = _get_engine()
+    if isinstance(engine.pool, StaticPool):
+        return 1
+    if isinstance(engine.pool, QueuePool):
+        if engine.url.get_backend_name() == "sqlite":
+            return engine.pool.size() + SQLITE_MAX_OVERFLOW
+        return engine.pool.size() + SERVER_MAX_OVERFLOW
+    return None
+
+
+@lru_cache(maxsize=1)
+def get_session_factory() -> sessionmaker:
+    """Get SQLAlchemy session factory."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=_get_engine())
+
+
+def create_all_tables(recreate: bool = False) -> None:
+    """
+    Create all database tables.
+    
+    Args:
+        recreate: Drop the existing tables, and all their data, first. This
+            is the upgrade path for databases with an older schema.
+    """
+    from .models import Base
     
+    engine = _get_engine()
+    if recreate:
+        Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
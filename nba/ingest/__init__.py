@@ -2,15 +2,22 @@
 Data ingestion modules for NBA data
 """
 
-from .games_ingest import ingest_games
+from .games_ingest import ingest_games, ingest_games_multi
 from .teams_ingest import ingest_teams
-from .players_ingest import ingest_players
-from .stats_ingest import ingest_team_stats, ingest_player_stats
+from .players_ingest import ingest_players, ingest_players_all_teams
+from .stats_ingest import (
+    ingest_team_stats, ingest_player_stats, ingest_all_player_stats,
+    ingest_season
+)
 
 __all__ = [
     "ingest_games",
+    "ingest_games_multi",
     "ingest_teams", 
     "ingest_players",
+    "ingest_players_all_teams",
     "ingest_team_stats",
-    "ingest_player_stats"
+    "ingest_player_stats",
+    "ingest_all_player_stats",
+    "ingest_season"
 ]
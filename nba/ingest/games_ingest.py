@@ -2,17 +2,45 @@
 Game data ingestion for NBA
 """
 
-from typing import List, Dict, Any, Optional
-from datetime import datetime, date
+import logging
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import product
+from typing import List, Dict, Any, Optional, Sequence, Union
+from datetime import date
+from sqlalchemy import and_, case, delete, func, insert, literal, select, union_all
 from sqlalchemy.orm import Session
 
+from nba.db.bulk import batched, upsert_rows
 from nba.db.session import get_session_factory
-from nba.db.models import Game, Team
-from nba.sources.nba_api_client_fixed import NBAAPIClientFixed as NBAAPIClient
+from nba.db.models import Game, Team, TeamSeasonSummary
+from nba.sources.nba_api_client_fixed import get_client
+
+
+log = logging.getLogger(__name__)
+
+# Rows per upsert statement / commit when ingesting games
+GAMES_PAGE_SIZE = 5_000
+
+
+@dataclass(slots=True, frozen=True)
+class GameRef:
+    """Lightweight reference to an ingested game, detached from any session."""
+    id: int
+    game_date: Optional[date]
+    home_abbr: str
+    away_abbr: str
+
+
+def _parse_ymd(value: str) -> date:
+    """Parse a 'YYYY-MM-DD' date (optionally followed by a time) without strptime."""
+    return date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
 
 
 def ingest_games(season: int, season_type: str = "Regular Season", 
-                session: Session = None) -> List[Game]:
+                session: Session = None, *,
+                return_ids: bool = False) -> Union[List[GameRef], List[int]]:
     """
     Ingest game data from NBA API.
     
@@ -20,11 +48,38 @@ def ingest_games(season: int, season_type: str = "Regular Season",
         season: NBA season year (e.g., 2023 for 2023-24 season)
         season_type: Season type ('Regular Season', 'Playoffs', etc.)
         session: Database session. If None, creates a new session.
+        return_ids: Return only the ingested game ids.
         
     Returns:
-        List of ingested Game objects.
+        List of GameRef for the ingested games, or their ids when return_ids is set.
     """
-    client = NBAAPIClient()
+    return ingest_games_multi([season], [season_type], session, return_ids=return_ids)
+
+
+def ingest_games_multi(seasons: Sequence[int], season_types: Sequence[str] = ("Regular Season",),
+                       session: Session = None, *,
+                       return_ids: bool = False,
+                       max_workers: int = 4) -> Union[List[GameRef], List[int]]:
+    """
+    Ingest game data for every (season, season type) pair in one batch.
+    
+    API calls for the pairs run in parallel; the combined rows are then
+    upserted in GAMES_PAGE_SIZE pages with a single team lookup.
+    
+    Args:
+        seasons: NBA season years (e.g., [2022, 2023])
+        season_types: Season types to fetch for each season
+        session: Database session. If None, creates a new session.
+        return_ids: Return only the ingested game ids.
+        max_workers: Maximum concurrent API calls.
+        
+    Returns:
+        List of GameRef for the ingested games, or their ids when return_ids is set.
+    """
+    client = get_client()
+    pairs = list(product(seasons, season_types))
+    if not pairs:
+        return []
     
     # Use provided session or create new one
     if session is None:
@@ -35,79 +90,177 @@ def ingest_games(season: int, season_type: str = "Regular Season",
         should_close = False
     
     try:
-        # Fetch games from API
-        games_data = client.get_games(season, season_type)
+        # Fetch games on worker threads so the HTTP round-trips overlap each
+        # other and the team lookup below; the session stays on this thread.
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pairs))) as executor:
+            games_futures = [
+                executor.submit(client.get_games, season, season_type)
+                for season, season_type in pairs
+            ]
+            
+            # Resolve team ids from one query instead of two lookups per game
+            team_map = dict(session.execute(select(Team.abbreviation, Team.id)).all())
+            
+            # Keyed by game id so a game returned for several pairs is written once
+            rows_by_id = {}
+            for (season, season_type), games_future in zip(pairs, games_futures):
+                for game_data in games_future.result():
+                    # Parse game date
+                    game_date = game_data.get("game_date")
+                    if not game_date:
+                        game_date = None
+                    elif isinstance(game_date, str):
+                        game_date = _parse_ymd(game_date)
+                    
+                    home_abbr = game_data["home_team_abbr"]
+                    away_abbr = game_data["away_team_abbr"]
+                    game_id = int(game_data["game_id"])
+                    
+                    # Sources that report an unplayed game as 0-0 would make
+                    # it look finished; store NULL so the generated home_win
+                    # stays NULL and the summary skips the game
+                    home_score = game_data.get("home_score")
+                    away_score = game_data.get("away_score")
+                    if not home_score and not away_score:
+                        home_score = away_score = None
+                    
+                    rows_by_id[game_id] = {
+                        "id": game_id,
+                        "game_date": game_date,
+                        "season": season,
+                        "season_type": season_type,
+                        "home_team_id": team_map.get(home_abbr.upper()),
+                        "away_team_id": team_map.get(away_abbr.upper()),
+                        "home_team_abbr": home_abbr,
+                        "away_team_abbr": away_abbr,
+                        "home_score": home_score,
+                        "away_score": away_score,
+                        "arena": game_data.get("arena"),
+                        "attendance": game_data.get("attendance"),
+                        "duration_minutes": game_data.get("duration_minutes")
+                    }
         
         ingested_games = []
         
-        for game_data in games_data:
-            # Check if game already exists
-            existing_game = session.query(Game).filter(
-                Game.id == game_data["game_id"]
-            ).first()
+        # Upsert page by page so multi-season backfills keep transactions bounded
+        for page in batched(rows_by_id.values(), GAMES_PAGE_SIZE):
+            page_ids = [row["id"] for row in page]
+            
+            # Cold load (none of the page exists yet): plain executemany INSERT
+            has_existing = session.scalar(
+                select(Game.id).where(Game.id.in_(page_ids)).limit(1)
+            ) is not None
+            if has_existing:
+                upsert_rows(session, Game, page, index_elements=["id"])
+            else:
+                session.execute(insert(Game), page)
             
-            if existing_game:
-                # Update existing game
-                for key, value in game_data.items():
-                    if hasattr(existing_game, key):
-                        setattr(existing_game, key, value)
-                ingested_games.append(existing_game)
+            if return_ids:
+                ingested_games.extend(page_ids)
             else:
-                # Get team references
-                home_team = get_team_by_abbreviation(game_data["home_team_abbr"], session)
-                away_team = get_team_by_abbreviation(game_data["away_team_abbr"], session)
-                
-                # Parse game date
-                game_date = None
-                if game_data.get("game_date"):
-                    if isinstance(game_data["game_date"], str):
-                        game_date = datetime.strptime(game_data["game_date"], "%Y-%m-%d").date()
-                    elif isinstance(game_data["game_date"], date):
-                        game_date = game_data["game_date"]
-                
-                # Determine home win
-                home_win = None
-                if game_data.get("home_score") is not None and game_data.get("away_score") is not None:
-                    home_win = game_data["home_score"] > game_data["away_score"]
-                
-                # Create new game
-                game = Game(
-                    id=game_data["game_id"],
-                    game_date=game_date,
-                    season=season,
-                    season_type=season_type,
-                    home_team_id=home_team.id if home_team else None,
-                    away_team_id=away_team.id if away_team else None,
-                    home_team_abbr=game_data["home_team_abbr"],
-                    away_team_abbr=game_data["away_team_abbr"],
-                    home_score=game_data.get("home_score"),
-                    away_score=game_data.get("away_score"),
-                    home_win=home_win,
-                    arena=game_data.get("arena"),
-                    attendance=game_data.get("attendance"),
-                    duration_minutes=game_data.get("duration_minutes")
+                ingested_games.extend(
+                    GameRef(row["id"], row["game_date"], row["home_team_abbr"], row["away_team_abbr"])
+                    for row in page
                 )
-                session.add(game)
-                ingested_games.append(game)
+            
+            if should_close:
+                session.commit()
+                # Nothing outside this function holds our session's instances
+                session.expunge_all()
+        
+        for season, season_type in pairs:
+            refresh_team_season_summary(season, season_type, session)
         
-        session.commit()
-        print(f"Successfully ingested {len(ingested_games)} games for {season} {season_type}")
+        # Callers that pass their own session own the transaction
+        if should_close:
+            session.commit()
+        else:
+            session.flush()
+        log.info("Ingested %d games for %s", len(ingested_games), pairs)
         
         return ingested_games
         
-    except Exception as e:
-        session.rollback()
-        print(f"Error ingesting games: {e}")
+    except Exception:
+        if should_close:
+            session.rollback()
+        log.exception("ingest_games failed for %s", pairs)
         raise
     finally:
         if should_close:
             session.close()
 
 
+def refresh_team_season_summary(season: int, season_type: str, session: Session) -> None:
+    """
+    Rebuild the team_season_summary rows for one season from the games table.
+    
+    Each game contributes a home-side and an away-side result row; those are
+    aggregated per team with a single INSERT ... SELECT, so readers get
+    standings from ~30 rows instead of re-scanning every game.
+    
+    Args:
+        season: NBA season year
+        season_type: Season type
+        session: Database session. The caller owns the transaction.
+    """
+    finished = and_(
+        Game.season == season,
+        Game.season_type == season_type,
+        Game.home_score.is_not(None),
+        Game.away_score.is_not(None),
+    )
+    home = select(
+        Game.home_team_id.label("team_id"),
+        Game.home_score.label("points_for"),
+        Game.away_score.label("points_against"),
+        literal(1).label("is_home"),
+    ).where(finished, Game.home_team_id.is_not(None))
+    away = select(
+        Game.away_team_id.label("team_id"),
+        Game.away_score.label("points_for"),
+        Game.home_score.label("points_against"),
+        literal(0).label("is_home"),
+    ).where(finished, Game.away_team_id.is_not(None))
+    results = union_all(home, away).subquery()
+    
+    won = results.c.points_for > results.c.points_against
+    summary = select(
+        results.c.team_id,
+        literal(season),
+        literal(season_type),
+        func.count(),
+        func.sum(case((won, 1), else_=0)),
+        func.sum(case((won, 0), else_=1)),
+        func.sum(case((and_(won, results.c.is_home == 1), 1), else_=0)),
+        func.sum(case((and_(won, results.c.is_home == 0), 1), else_=0)),
+        func.avg(results.c.points_for),
+        func.avg(results.c.points_against),
+    ).group_by(results.c.team_id)
+    
+    session.execute(
+        delete(TeamSeasonSummary).where(
+            TeamSeasonSummary.season == season,
+            TeamSeasonSummary.season_type == season_type
+        )
+    )
+    session.execute(
+        insert(TeamSeasonSummary).from_select(
+            [
+                "team_id", "season", "season_type", "games_played", "wins", "losses",
+                "home_wins", "away_wins", "points_per_game", "opponent_points_per_game",
+            ],
+            summary
+        )
+    )
+
+
 def get_team_by_abbreviation(abbreviation: str, session: Session) -> Optional[Team]:
     """
     Get team by abbreviation.
     
+    Deprecated: use nba.ingest.teams_ingest.get_team_by_abbreviation.
+    ingest_games no longer calls this per game.
+    
     Args:
         abbreviation: Team abbreviation (e.g., 'LAL', 'BOS')
         session: Database session
@@ -115,23 +268,54 @@ def get_team_by_abbreviation(abbreviation: str, session: Session) -> Optional[Te
     Returns:
         Team object or None if not found.
     """
-    return session.query(Team).filter(
-        Team.abbreviation == abbreviation.upper()
-    ).first()
+    warnings.warn(
+        "nba.ingest.games_ingest.get_team_by_abbreviation is deprecated; "
+        "use nba.ingest.teams_ingest.get_team_by_abbreviation instead",
+        DeprecationWarning,
+        stacklevel=2
+    )
+    return session.scalar(
+        select(Team).where(Team.abbreviation == abbreviation.upper()).limit(1)
+    )
+
+
+# Columns returned by the game read helpers unless the caller asks for others
+DEFAULT_GAME_COLUMNS = (
+    Game.id,
+    Game.game_date,
+    Game.home_team_abbr,
+    Game.away_team_abbr,
+    Game.home_score,
+    Game.away_score,
+)
+
+
+def _select_games(session: Session, columns: Optional[Sequence[Any]], *criteria,
+                  order_by: Sequence[Any] = ()) -> List[Any]:
+    """Run a projected select over games, returning plain values for a single column."""
+    columns = list(columns) if columns is not None else list(DEFAULT_GAME_COLUMNS)
+    result = session.execute(select(*columns).where(*criteria).order_by(*order_by))
+    if len(columns) == 1:
+        return result.scalars().all()
+    return result.all()
 
 
 def get_games_by_season(season: int, season_type: str = "Regular Season", 
-                       session: Session = None) -> List[Game]:
+                       session: Session = None, *,
+                       columns: Optional[Sequence[Any]] = None) -> List[Any]:
     """
-    Get all games for a specific season.
+    Get all games for a specific season, ordered by game date.
     
     Args:
         season: NBA season year
         season_type: Season type
         session: Database session. If None, creates a new session.
+        columns: Columns to select. Defaults to DEFAULT_GAME_COLUMNS; pass
+            [Game] to get full Game objects.
         
     Returns:
-        List of Game objects.
+        List of rows with the selected columns, or plain values when a
+        single column or entity is selected.
     """
     if session is None:
         session_factory = get_session_factory()
@@ -141,18 +325,20 @@ def get_games_by_season(season: int, season_type: str = "Regular Season",
         should_close = False
     
     try:
-        games = session.query(Game).filter(
+        return _select_games(
+            session, columns,
             Game.season == season,
-            Game.season_type == season_type
-        ).all()
-        return games
+            Game.season_type == season_type,
+            order_by=(Game.game_date,)
+        )
     finally:
         if should_close:
             session.close()
 
 
 def get_games_by_date_range(start_date: date, end_date: date, 
-                           session: Session = None) -> List[Game]:
+                           session: Session = None, *,
+                           columns: Optional[Sequence[Any]] = None) -> List[Any]:
     """
     Get games within a date range.
     
@@ -160,9 +346,12 @@ def get_games_by_date_range(start_date: date, end_date: date,
         start_date: Start date
         end_date: End date
         session: Database session. If None, creates a new session.
+        columns: Columns to select. Defaults to DEFAULT_GAME_COLUMNS; pass
+            [Game] to get full Game objects.
         
     Returns:
-        List of Game objects.
+        List of rows with the selected columns, or plain values when a
+        single column or entity is selected.
     """
     if session is None:
         session_factory = get_session_factory()
@@ -172,11 +361,11 @@ def get_games_by_date_range(start_date: date, end_date: date,
         should_close = False
     
     try:
-        games = session.query(Game).filter(
+        return _select_games(
+            session, columns,
             Game.game_date >= start_date,
             Game.game_date <= end_date
-        ).all()
-        return games
+        )
     finally:
         if should_close:
             session.close()
@@ -2,13 +2,64 @@
 Player data ingestion for NBA
 """
 
-from typing import List, Dict, Any, Optional
-from datetime import datetime, date
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Dict, Any, Optional, Sequence
+from datetime import date
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from nba.db.bulk import upsert_rows
 from nba.db.session import get_session_factory
 from nba.db.models import Player, Team
-from nba.sources.nba_api_client_fixed import NBAAPIClientFixed as NBAAPIClient
+from nba.sources.nba_api_client_fixed import get_client
+
+
+log = logging.getLogger(__name__)
+
+
+# NBA player ID -> primary key, filled by get_player_by_id from committed
+# rows only and cleared by the ingest functions
+_player_pks: Dict[str, int] = {}
+
+# Players per upsert statement when ingesting players
+PLAYERS_PAGE_SIZE = 250
+
+# Columns refreshed when an ingested player already exists
+PLAYER_UPDATE_COLUMNS = (
+    "name",
+    "first_name",
+    "last_name",
+    "team_id",
+    "position",
+    "height",
+    "weight",
+    "jersey_number",
+    "is_active",
+)
+
+
+def _upsert_players(session: Session, players_data: List[Dict[str, Any]],
+                    team_map: Dict[str, int]) -> List[str]:
+    """Upsert one batch of API player data, returning the written player_ids."""
+    mappings = [player_mapping_from_data(player_data, team_map) for player_data in players_data]
+    
+    # Keyed by player_id so a repeated player in the batch is written once
+    rows = {}
+    for mapping in mappings:
+        if mapping:
+            rows[mapping["player_id"]] = mapping
+    
+    # One INSERT ... ON CONFLICT DO UPDATE per batch; blank API fields keep
+    # the stored value and unchanged players are not rewritten
+    upsert_rows(
+        session, Player, list(rows.values()),
+        index_elements=["player_id"],
+        update_columns=PLAYER_UPDATE_COLUMNS,
+        keep_existing_on_null=True,
+        skip_unchanged=True
+    )
+    return list(rows)
 
 
 def ingest_players(season: Optional[int] = None, team_id: Optional[str] = None,
@@ -24,7 +75,7 @@ def ingest_players(season: Optional[int] = None, team_id: Optional[str] = None,
     Returns:
         List of ingested Player objects.
     """
-    client = NBAAPIClient()
+    client = get_client()
     
     # Use provided session or create new one
     if session is None:
@@ -35,180 +86,224 @@ def ingest_players(season: Optional[int] = None, team_id: Optional[str] = None,
         should_close = False
     
     try:
-        # Fetch players from API
-        players_data = client.get_players(season, team_id)
+        # Map NBA team ids to team primary keys once for the whole batch
+        team_map = dict(session.query(Team.team_id, Team.id).all())
         
-        ingested_players = []
+        # Ordered set of every player_id written, for the final reload
+        ingested_ids = {}
         
-        for player_data in players_data:
-            # Check if player already exists
-            existing_player = session.query(Player).filter(
-                Player.player_id == player_data.get("player_id")
-            ).first()
-            
-            if existing_player:
-                # Update existing player
-                update_player_data(existing_player, player_data)
-                ingested_players.append(existing_player)
-            else:
-                # Create new player
-                player = create_player_from_data(player_data, session)
-                if player:
-                    session.add(player)
-                    ingested_players.append(player)
+        # Write each page as it arrives instead of materializing the full payload.
+        # Pending caller state is flushed once at the end, not before every page.
+        with session.no_autoflush:
+            for page in client.iter_players(season, team_id, page_size=PLAYERS_PAGE_SIZE):
+                ingested_ids.update(dict.fromkeys(_upsert_players(session, page, team_map)))
         
-        session.commit()
-        print(f"Successfully ingested {len(ingested_players)} players")
+        # populate_existing refreshes any instances already in the identity map
+        ingested_players = session.query(Player).filter(
+            Player.player_id.in_(list(ingested_ids))
+        ).populate_existing().all()
+        
+        # Callers that pass their own session own the transaction
+        if should_close:
+            session.commit()
+        else:
+            session.flush()
+        _player_pks.clear()
+        log.info("Ingested %d players", len(ingested_players))
         
         return ingested_players
         
-    except Exception as e:
-        session.rollback()
-        print(f"Error ingesting players: {e}")
+    except Exception:
+        if should_close:
+            session.rollback()
+        log.exception("ingest_players failed")
         raise
     finally:
         if should_close:
             session.close()
 
 
-def create_player_from_data(player_data: Dict[str, Any], session: Session) -> Optional[Player]:
+def ingest_players_all_teams(season: int, session: Session = None, *,
+                             max_workers: int = 4) -> List[Player]:
     """
-    Create a Player object from API data.
+    Ingest every team's roster for a season.
+    
+    Roster requests for all teams in the database run concurrently on a
+    thread pool; the combined rosters are then written in one bulk upsert.
     
     Args:
-        player_data: Player data from API
-        session: Database session
+        season: NBA season year (e.g., 2023 for 2023-24 season)
+        session: Database session. If None, creates a new session.
+        max_workers: Maximum concurrent roster requests.
         
     Returns:
-        Player object or None if invalid data.
+        List of ingested Player objects.
     """
+    client = get_client()
+    
+    # Use provided session or create new one
+    if session is None:
+        session_factory = get_session_factory()
+        session = session_factory()
+        should_close = True
+    else:
+        should_close = False
+    
     try:
-        # Get team reference
-        team = None
-        if player_data.get("team_id"):
-            team = session.query(Team).filter(
-                Team.team_id == str(player_data["team_id"])
-            ).first()
-        
-        # Parse birth date
-        birth_date = None
-        if player_data.get("birth_date"):
-            try:
-                birth_date = datetime.strptime(player_data["birth_date"], "%Y-%m-%d").date()
-            except (ValueError, TypeError):
-                pass
+        team_map = dict(session.query(Team.team_id, Team.id).all())
+        if not team_map:
+            log.warning("No teams found; run ingest-teams first")
+            return []
         
-        # Parse draft information
-        draft_year = None
-        draft_round = None
-        draft_number = None
+        # Roster fetches are network-bound; the session stays on this thread
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(team_map))) as executor:
+            rosters = executor.map(
+                lambda nba_team_id: client.get_team_roster(nba_team_id, season),
+                team_map
+            )
+            players_data = [player_data for roster in rosters for player_data in roster]
         
-        if player_data.get("draft_year"):
-            try:
-                draft_year = int(player_data["draft_year"])
-            except (ValueError, TypeError):
-                pass
+        ingested_ids = _upsert_players(session, players_data, team_map)
         
-        if player_data.get("draft_round"):
-            try:
-                draft_round = int(player_data["draft_round"])
-            except (ValueError, TypeError):
-                pass
+        # populate_existing refreshes any instances already in the identity map
+        ingested_players = session.query(Player).filter(
+            Player.player_id.in_(ingested_ids)
+        ).populate_existing().all()
         
-        if player_data.get("draft_number"):
-            try:
-                draft_number = int(player_data["draft_number"])
-            except (ValueError, TypeError):
-                pass
-        
-        # Parse weight
-        weight = None
-        if player_data.get("weight"):
-            try:
-                weight = int(player_data["weight"])
-            except (ValueError, TypeError):
-                pass
-        
-        # Split name into first and last
-        full_name = player_data.get("name", "")
-        name_parts = full_name.split(" ", 1)
-        first_name = name_parts[0] if len(name_parts) > 0 else ""
-        last_name = name_parts[1] if len(name_parts) > 1 else ""
-        
-        player = Player(
-            player_id=str(player_data.get("player_id", "")),
-            name=full_name,
-            first_name=first_name,
-            last_name=last_name,
-            team_id=team.id if team else None,
-            position=player_data.get("position"),
-            height=player_data.get("height"),
-            weight=weight,
-            birth_date=birth_date,
-            birth_place=player_data.get("birth_place"),
-            college=player_data.get("college"),
-            draft_year=draft_year,
-            draft_round=draft_round,
-            draft_number=draft_number,
-            is_active=player_data.get("is_active", True),
-            jersey_number=player_data.get("jersey_number")
-        )
+        # Callers that pass their own session own the transaction
+        if should_close:
+            session.commit()
+        else:
+            session.flush()
+        _player_pks.clear()
+        log.info("Ingested %d players from %d team rosters", len(ingested_players), len(team_map))
         
-        return player
+        return ingested_players
         
-    except Exception as e:
-        print(f"Error creating player from data: {e}")
+    except Exception:
+        if should_close:
+            session.rollback()
+        log.exception("ingest_players_all_teams failed for %s", season)
+        raise
+    finally:
+        if should_close:
+            session.close()
+
+
+# (API field, Player column) pairs parsed as integers
+_INT_FIELDS = (
+    ("draft_year", "draft_year"),
+    ("draft_round", "draft_round"),
+    ("draft_number", "draft_number"),
+    ("weight", "weight"),
+)
+
+
+def _safe_int(value: Any) -> Optional[int]:
+    """Convert an API value to int, mapping blanks and unparsable values to None."""
+    if not value:
+        return None
+    try:
+        return int(value)
+    except (ValueError, TypeError):
         return None
 
 
-def update_player_data(player: Player, player_data: Dict[str, Any]) -> None:
+def player_mapping_from_data(player_data: Dict[str, Any],
+                             team_map: Dict[str, int]) -> Optional[Dict[str, Any]]:
     """
-    Update existing player with new data.
+    Build Player column values from API data.
+    
+    Blank optional fields map to None so upserts keep the stored value.
     
     Args:
-        player: Existing Player object
-        player_data: New player data from API
+        player_data: Player data from API
+        team_map: Mapping of NBA team ID to Team primary key
+        
+    Returns:
+        Dict of Player column values or None if invalid data.
     """
     try:
-        # Update basic information
-        if player_data.get("name"):
-            player.name = player_data["name"]
-            name_parts = player.name.split(" ", 1)
-            player.first_name = name_parts[0] if len(name_parts) > 0 else ""
-            player.last_name = name_parts[1] if len(name_parts) > 1 else ""
-        
-        if player_data.get("position"):
-            player.position = player_data["position"]
-        
-        if player_data.get("height"):
-            player.height = player_data["height"]
+        # Get team reference
+        team_pk = None
+        if player_data.get("team_id"):
+            team_pk = team_map.get(str(player_data["team_id"]))
         
-        if player_data.get("weight"):
+        # Parse birth date
+        birth_date = None
+        if player_data.get("birth_date"):
             try:
-                player.weight = int(player_data["weight"])
+                # fromisoformat is C-implemented; slicing drops any time suffix
+                birth_date = date.fromisoformat(player_data["birth_date"][:10])
             except (ValueError, TypeError):
                 pass
         
-        if player_data.get("jersey_number"):
-            player.jersey_number = player_data["jersey_number"]
+        # Parse integer fields (draft information, weight)
+        parsed = {dst: _safe_int(player_data.get(src)) for src, dst in _INT_FIELDS}
+        
+        # Split name into first and last
+        full_name = player_data.get("name") or None
+        first_name = last_name = None
+        if full_name:
+            name_parts = full_name.split(" ", 1)
+            first_name = name_parts[0]
+            last_name = name_parts[1] if len(name_parts) > 1 else ""
         
-        if "is_active" in player_data:
-            player.is_active = player_data["is_active"]
+        return {
+            "player_id": str(player_data.get("player_id", "")),
+            "name": full_name,
+            "first_name": first_name,
+            "last_name": last_name,
+            "team_id": team_pk,
+            "position": player_data.get("position") or None,
+            "height": player_data.get("height") or None,
+            "birth_date": birth_date,
+            "birth_place": player_data.get("birth_place"),
+            "college": player_data.get("college"),
+            "is_active": player_data.get("is_active", True),
+            "jersey_number": player_data.get("jersey_number") or None,
+            **parsed
+        }
         
-    except Exception as e:
-        print(f"Error updating player data: {e}")
+    except Exception:
+        log.exception("Error creating player from data")
+        return None
+
 
+# Columns returned by the player read helpers unless the caller asks for others
+DEFAULT_PLAYER_COLUMNS = (
+    Player.id,
+    Player.player_id,
+    Player.name,
+    Player.team_id,
+    Player.position,
+    Player.is_active,
+)
 
-def get_players_by_team(team_id: int, session: Session = None) -> List[Player]:
+
+def _select_players(session: Session, columns: Optional[Sequence[Any]], *criteria) -> List[Any]:
+    """Run a projected select over players, returning plain values for a single column."""
+    columns = list(columns) if columns is not None else list(DEFAULT_PLAYER_COLUMNS)
+    result = session.execute(select(*columns).where(*criteria))
+    if len(columns) == 1:
+        return result.scalars().all()
+    return result.all()
+
+
+def get_players_by_team(team_id: int, session: Session = None, *,
+                        columns: Optional[Sequence[Any]] = None) -> List[Any]:
     """
     Get all players for a specific team.
     
     Args:
         team_id: Team ID
         session: Database session. If None, creates a new session.
+        columns: Columns to select. Defaults to DEFAULT_PLAYER_COLUMNS; pass
+            [Player] to get full Player objects.
         
     Returns:
-        List of Player objects.
+        List of rows with the selected columns, or plain values when a
+        single column or entity is selected.
     """
     if session is None:
         session_factory = get_session_factory()
@@ -218,11 +313,11 @@ def get_players_by_team(team_id: int, session: Session = None) -> List[Player]:
         should_close = False
     
     try:
-        players = session.query(Player).filter(
+        return _select_players(
+            session, columns,
             Player.team_id == team_id,
             Player.is_active == True
-        ).all()
-        return players
+        )
     finally:
         if should_close:
             session.close()
@@ -232,6 +327,11 @@ def get_player_by_id(player_id: str, session: Session = None) -> Optional[Player
     """
     Get player by NBA player ID.
     
+    NBA ID to primary key pairs read through a fresh session (so from
+    committed data) are remembered; repeat lookups then resolve through
+    session.get() and the identity map. Every lookup, cached or not, goes
+    through the given session.
+    
     Args:
         player_id: NBA player ID
         session: Database session. If None, creates a new session.
@@ -247,24 +347,39 @@ def get_player_by_id(player_id: str, session: Session = None) -> Optional[Player
         should_close = False
     
     try:
-        player = session.query(Player).filter(
-            Player.player_id == player_id
+        player_pk = _player_pks.get(player_id)
+        if player_pk is not None:
+            player = session.get(Player, player_pk)
+            # Another writer may have removed or replaced the row since
+            if player is not None and player.player_id == player_id:
+                return player
+        
+        player = session.scalars(
+            select(Player).where(Player.player_id == player_id).limit(1)
         ).first()
+        # A caller's session may see its own uncommitted rows, which must not
+        # outlive its transaction in a process-wide cache
+        if player is not None and should_close:
+            _player_pks[player_id] = player.id
         return player
     finally:
         if should_close:
             session.close()
 
 
-def get_active_players(session: Session = None) -> List[Player]:
+def get_active_players(session: Session = None, *,
+                       columns: Optional[Sequence[Any]] = None) -> List[Any]:
     """
     Get all active players.
     
     Args:
         session: Database session. If None, creates a new session.
+        columns: Columns to select. Defaults to DEFAULT_PLAYER_COLUMNS; pass
+            [Player] to get full Player objects.
         
     Returns:
-        List of active Player objects.
+        List of rows with the selected columns, or plain values when a
+        single column or entity is selected.
     """
     if session is None:
         session_factory = get_session_factory()
@@ -274,10 +389,50 @@ def get_active_players(session: Session = None) -> List[Player]:
         should_close = False
     
     try:
-        players = session.query(Player).filter(
-            Player.is_active == True
-        ).all()
-        return players
+        return _select_players(session, columns, Player.is_active == True)
+    finally:
+        if should_close:
+            session.close()
+
+
+def iter_active_players(session: Session = None, *,
+                        columns: Optional[Sequence[Any]] = None,
+                        chunk_size: int = 1000) -> Iterator[Any]:
+    """
+    Stream all active players without materializing the full result.
+    
+    Rows are fetched chunk_size at a time (a server-side cursor where the
+    driver supports one), so memory stays bounded for large pipelines.
+    
+    Args:
+        session: Database session. If None, creates a new session that is
+            closed once the iterator is exhausted or closed.
+        columns: Columns to select. Defaults to DEFAULT_PLAYER_COLUMNS; pass
+            [Player] to get full Player objects.
+        chunk_size: Rows fetched per round-trip.
+        
+    Yields:
+        Rows with the selected columns, or plain values when a single column
+        or entity is selected.
+    """
+    if session is None:
+        session_factory = get_session_factory()
+        session = session_factory()
+        should_close = True
+    else:
+        should_close = False
+    
+    try:
+        columns = list(columns) if columns is not None else list(DEFAULT_PLAYER_COLUMNS)
+        stmt = (
+            select(*columns)
+            .where(Player.is_active == True)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = session.execute(stmt)
+        if len(columns) == 1:
+            result = result.scalars()
+        yield from result
     finally:
         if should_close:
             session.close()
@@ -2,16 +2,128 @@
 Statistics data ingestion for NBA
 """
 
-from typing import List, Dict, Any, Optional
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
+from typing import Iterable, List, Dict, Any, Optional, Tuple, Union
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from nba.db.bulk import batched, upsert_rows
 from nba.db.session import get_session_factory
 from nba.db.models import TeamStats, PlayerSeasonStats, Team, Player
-from nba.sources.nba_api_client_fixed import NBAAPIClientFixed as NBAAPIClient
+from nba.sources.nba_api_client_fixed import drop_cached_responses, get_client
+
+
+log = logging.getLogger(__name__)
+
+# Rows per upsert statement when ingesting stats
+STATS_PAGE_SIZE = 1_000
+
+
+def safe_float(value: Any) -> Optional[float]:
+    """Convert an API value to float, returning None if it is missing or invalid."""
+    # The stats endpoints return JSON numbers almost always; only strings and
+    # other oddities pay for the try/except in the slow path
+    if isinstance(value, (int, float)):
+        return float(value)
+    if value is None:
+        return None
+    return _safe_float_slow(value)
+
+
+def _safe_float_slow(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def safe_int(value: Any) -> Optional[int]:
+    """Convert an API value to int, returning None if it is missing or invalid."""
+    # Floats take the slow path too: int() raises on NaN and infinity
+    if type(value) is int:
+        return value
+    if value is None:
+        return None
+    return _safe_int_slow(value)
+
+
+def _safe_int_slow(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+# (model attribute, API key, converter) for every stat column copied from the
+# API payload; the create and update paths both walk these tables
+TEAM_STATS_FIELDS = (
+    ("games_played", "GP", safe_int),
+    ("wins", "W", safe_int),
+    ("losses", "L", safe_int),
+    ("win_percentage", "W_PCT", safe_float),
+    ("points_per_game", "PTS", safe_float),
+    ("field_goal_percentage", "FG_PCT", safe_float),
+    ("three_point_percentage", "FG3_PCT", safe_float),
+    ("free_throw_percentage", "FT_PCT", safe_float),
+    ("offensive_rebounds_per_game", "OREB", safe_float),
+    ("defensive_rebounds_per_game", "DREB", safe_float),
+    ("assists_per_game", "AST", safe_float),
+    ("steals_per_game", "STL", safe_float),
+    ("blocks_per_game", "BLK", safe_float),
+    ("turnovers_per_game", "TOV", safe_float),
+    ("personal_fouls_per_game", "PF", safe_float),
+    ("pace", "PACE", safe_float),
+    ("offensive_rating", "OFFRTG", safe_float),
+    ("defensive_rating", "DEFRTG", safe_float),
+    ("net_rating", "NETRTG", safe_float),
+)
+
+PLAYER_STATS_FIELDS = (
+    ("games_played", "GP", safe_int),
+    ("games_started", "GS", safe_int),
+    ("minutes_per_game", "MIN", safe_float),
+    ("points_per_game", "PTS", safe_float),
+    ("rebounds_per_game", "REB", safe_float),
+    ("assists_per_game", "AST", safe_float),
+    ("steals_per_game", "STL", safe_float),
+    ("blocks_per_game", "BLK", safe_float),
+    ("turnovers_per_game", "TOV", safe_float),
+    ("personal_fouls_per_game", "PF", safe_float),
+    ("field_goal_percentage", "FG_PCT", safe_float),
+    ("three_point_percentage", "FG3_PCT", safe_float),
+    ("free_throw_percentage", "FT_PCT", safe_float),
+    ("true_shooting_percentage", "TS_PCT", safe_float),
+    ("effective_field_goal_percentage", "EFG_PCT", safe_float),
+    ("offensive_rebound_percentage", "OREB_PCT", safe_float),
+    ("defensive_rebound_percentage", "DREB_PCT", safe_float),
+    ("assist_percentage", "AST_PCT", safe_float),
+    ("turnover_percentage", "TOV_PCT", safe_float),
+    ("usage_percentage", "USG_PCT", safe_float),
+    ("player_efficiency_rating", "PER", safe_float),
+)
+
+
+def _stats_values(stat_data: Dict[str, Any], fields) -> Dict[str, Any]:
+    """
+    Convert the stat columns of one API row with a field table.
+    
+    Args:
+        stat_data: Statistics row from the API
+        fields: (model attribute, API key, converter) table
+        
+    Returns:
+        Column values keyed by model attribute; missing keys map to None.
+    """
+    get = stat_data.get
+    return {attr: cast(get(key)) for attr, key, cast in fields}
 
 
 def ingest_team_stats(season: int, season_type: str = "Regular Season",
-                     session: Session = None) -> List[TeamStats]:
+                     session: Session = None, *,
+                     force_refresh: bool = False,
+                     return_count: bool = False) -> Union[List[TeamStats], int]:
     """
     Ingest team statistics from NBA API.
     
@@ -19,11 +131,15 @@ def ingest_team_stats(season: int, season_type: str = "Regular Season",
         season: NBA season year (e.g., 2023 for 2023-24 season)
         season_type: Season type ('Regular Season', 'Playoffs', etc.)
         session: Database session. If None, creates a new session.
+        force_refresh: Drop cached API responses for the endpoint and fetch
+            fresh data (only matters when requests-cache is installed).
+        return_count: Return only the number of rows written, without loading
+            the TeamStats objects.
         
     Returns:
-        List of ingested TeamStats objects.
+        List of ingested TeamStats objects, or their count when return_count is set.
     """
-    client = NBAAPIClient()
+    client = get_client()
     
     # Use provided session or create new one
     if session is None:
@@ -34,174 +150,265 @@ def ingest_team_stats(season: int, season_type: str = "Regular Season",
         should_close = False
     
     try:
-        # Fetch team stats from API
-        stats_data = client.get_team_stats(season, season_type)
+        # Rows are streamed from the response and consumed one at a time
+        stats_data = client.iter_team_stats(season, season_type, force_refresh=force_refresh)
         
-        ingested_stats = []
+        # Resolve API team ids in memory instead of one SELECT per row; only
+        # the key columns are needed, so skip ORM entity loading
+        team_pk = dict(session.execute(select(Team.team_id, Team.id)).all())
+        
+        # Keyed by team so a repeated team in the payload is written once
+        rows = {}
         
         for stat_data in stats_data:
             # Get team reference
-            team = session.query(Team).filter(
-                Team.team_id == str(stat_data.get("TEAM_ID", ""))
-            ).first()
+            team_id = team_pk.get(str(stat_data.get("TEAM_ID", "")))
             
-            if not team:
-                print(f"Team not found for TEAM_ID: {stat_data.get('TEAM_ID')}")
+            if team_id is None:
+                log.debug("Team not found for TEAM_ID %s", stat_data.get("TEAM_ID"))
                 continue
             
-            # Check if stats already exist
-            existing_stats = session.query(TeamStats).filter(
-                TeamStats.team_id == team.id,
+            mapping = team_stats_mapping_from_data(stat_data, team_id, season, season_type)
+            if mapping:
+                rows[team_id] = mapping
+        
+        # INSERT ... ON CONFLICT against uq_team_stats_team_season_type, one
+        # statement per page; missing values keep what is already stored
+        for page in batched(rows.values(), STATS_PAGE_SIZE):
+            upsert_rows(
+                session,
+                TeamStats,
+                page,
+                index_elements=["team_id", "season", "season_type"],
+                keep_existing_on_null=True
+            )
+        
+        if return_count:
+            ingested_stats = len(rows)
+        else:
+            # populate_existing refreshes any instances already in the identity map
+            ingested_stats = session.query(TeamStats).filter(
                 TeamStats.season == season,
-                TeamStats.season_type == season_type
-            ).first()
-            
-            if existing_stats:
-                # Update existing stats
-                update_team_stats(existing_stats, stat_data)
-                ingested_stats.append(existing_stats)
-            else:
-                # Create new stats
-                team_stats = create_team_stats_from_data(stat_data, team, season, season_type)
-                if team_stats:
-                    session.add(team_stats)
-                    ingested_stats.append(team_stats)
-        
-        session.commit()
-        print(f"Successfully ingested team stats for {len(ingested_stats)} teams")
+                TeamStats.season_type == season_type,
+                TeamStats.team_id.in_(list(rows))
+            ).populate_existing().all()
+        
+        # Callers that pass their own session own the transaction
+        if should_close:
+            session.commit()
+        else:
+            session.flush()
+        log.info("Ingested team stats for %d teams", len(rows))
         
         return ingested_stats
         
-    except Exception as e:
-        session.rollback()
-        print(f"Error ingesting team stats: {e}")
+    except Exception:
+        if should_close:
+            session.rollback()
+        log.exception("ingest_team_stats failed for %s %s", season, season_type)
         raise
     finally:
         if should_close:
             session.close()
 
 
-def create_team_stats_from_data(stat_data: Dict[str, Any], team: Team, 
-                               season: int, season_type: str) -> Optional[TeamStats]:
+def team_stats_mapping_from_data(stat_data: Dict[str, Any], team_id: int,
+                                season: int, season_type: str) -> Optional[Dict[str, Any]]:
     """
-    Create a TeamStats object from API data.
+    Build a TeamStats column mapping from API data.
     
     Args:
         stat_data: Team statistics data from API
-        team: Team object
+        team_id: Primary key of the team
         season: Season year
         season_type: Season type
         
     Returns:
-        TeamStats object or None if invalid data.
+        Column mapping for TeamStats or None if invalid data.
     """
     try:
-        # Parse numeric values
-        def safe_float(value):
-            try:
-                return float(value) if value is not None else None
-            except (ValueError, TypeError):
-                return None
-        
-        def safe_int(value):
-            try:
-                return int(value) if value is not None else None
-            except (ValueError, TypeError):
-                return None
-        
-        team_stats = TeamStats(
-            team_id=team.id,
-            season=season,
-            season_type=season_type,
-            games_played=safe_int(stat_data.get("GP")),
-            wins=safe_int(stat_data.get("W")),
-            losses=safe_int(stat_data.get("L")),
-            win_percentage=safe_float(stat_data.get("W_PCT")),
-            points_per_game=safe_float(stat_data.get("PTS")),
-            field_goal_percentage=safe_float(stat_data.get("FG_PCT")),
-            three_point_percentage=safe_float(stat_data.get("FG3_PCT")),
-            free_throw_percentage=safe_float(stat_data.get("FT_PCT")),
-            offensive_rebounds_per_game=safe_float(stat_data.get("OREB")),
-            defensive_rebounds_per_game=safe_float(stat_data.get("DREB")),
-            assists_per_game=safe_float(stat_data.get("AST")),
-            steals_per_game=safe_float(stat_data.get("STL")),
-            blocks_per_game=safe_float(stat_data.get("BLK")),
-            turnovers_per_game=safe_float(stat_data.get("TOV")),
-            personal_fouls_per_game=safe_float(stat_data.get("PF")),
-            pace=safe_float(stat_data.get("PACE")),
-            offensive_rating=safe_float(stat_data.get("OFFRTG")),
-            defensive_rating=safe_float(stat_data.get("DEFRTG")),
-            net_rating=safe_float(stat_data.get("NETRTG"))
-        )
-        
-        return team_stats
+        return {
+            **_stats_values(stat_data, TEAM_STATS_FIELDS),
+            "team_id": team_id,
+            "season": season,
+            "season_type": season_type,
+        }
         
-    except Exception as e:
-        print(f"Error creating team stats from data: {e}")
+    except Exception:
+        log.exception("Error creating team stats from data")
         return None
 
 
-def update_team_stats(team_stats: TeamStats, stat_data: Dict[str, Any]) -> None:
+def ingest_player_stats(season: int, season_type: str = "Regular Season",
+                       team_id: Optional[str] = None, session: Session = None, *,
+                       force_refresh: bool = False,
+                       return_count: bool = False) -> Union[List[PlayerSeasonStats], int]:
     """
-    Update existing team stats with new data.
+    Ingest player statistics from NBA API.
     
     Args:
-        team_stats: Existing TeamStats object
-        stat_data: New statistics data from API
+        season: NBA season year (e.g., 2023 for 2023-24 season)
+        season_type: Season type ('Regular Season', 'Playoffs', etc.)
+        team_id: Specific team ID to ingest stats for
+        session: Database session. If None, creates a new session.
+        force_refresh: Drop cached API responses for the endpoint and fetch
+            fresh data (only matters when requests-cache is installed).
+        return_count: Return only the number of rows written, without loading
+            the PlayerSeasonStats objects.
+        
+    Returns:
+        List of ingested PlayerSeasonStats objects, or their count when
+        return_count is set.
     """
+    client = get_client()
+    
+    # Use provided session or create new one
+    if session is None:
+        session_factory = get_session_factory()
+        session = session_factory()
+        should_close = True
+    else:
+        should_close = False
+    
     try:
-        def safe_float(value):
-            try:
-                return float(value) if value is not None else None
-            except (ValueError, TypeError):
-                return None
-        
-        def safe_int(value):
-            try:
-                return int(value) if value is not None else None
-            except (ValueError, TypeError):
-                return None
-        
-        # Update all fields
-        team_stats.games_played = safe_int(stat_data.get("GP")) or team_stats.games_played
-        team_stats.wins = safe_int(stat_data.get("W")) or team_stats.wins
-        team_stats.losses = safe_int(stat_data.get("L")) or team_stats.losses
-        team_stats.win_percentage = safe_float(stat_data.get("W_PCT")) or team_stats.win_percentage
-        team_stats.points_per_game = safe_float(stat_data.get("PTS")) or team_stats.points_per_game
-        team_stats.field_goal_percentage = safe_float(stat_data.get("FG_PCT")) or team_stats.field_goal_percentage
-        team_stats.three_point_percentage = safe_float(stat_data.get("FG3_PCT")) or team_stats.three_point_percentage
-        team_stats.free_throw_percentage = safe_float(stat_data.get("FT_PCT")) or team_stats.free_throw_percentage
-        team_stats.offensive_rebounds_per_game = safe_float(stat_data.get("OREB")) or team_stats.offensive_rebounds_per_game
-        team_stats.defensive_rebounds_per_game = safe_float(stat_data.get("DREB")) or team_stats.defensive_rebounds_per_game
-        team_stats.assists_per_game = safe_float(stat_data.get("AST")) or team_stats.assists_per_game
-        team_stats.steals_per_game = safe_float(stat_data.get("STL")) or team_stats.steals_per_game
-        team_stats.blocks_per_game = safe_float(stat_data.get("BLK")) or team_stats.blocks_per_game
-        team_stats.turnovers_per_game = safe_float(stat_data.get("TOV")) or team_stats.turnovers_per_game
-        team_stats.personal_fouls_per_game = safe_float(stat_data.get("PF")) or team_stats.personal_fouls_per_game
-        team_stats.pace = safe_float(stat_data.get("PACE")) or team_stats.pace
-        team_stats.offensive_rating = safe_float(stat_data.get("OFFRTG")) or team_stats.offensive_rating
-        team_stats.defensive_rating = safe_float(stat_data.get("DEFRTG")) or team_stats.defensive_rating
-        team_stats.net_rating = safe_float(stat_data.get("NETRTG")) or team_stats.net_rating
-        
-    except Exception as e:
-        print(f"Error updating team stats: {e}")
+        # Rows are streamed from the response and consumed one at a time
+        stats_data = client.iter_player_stats(
+            season, season_type, team_id, force_refresh=force_refresh
+        )
+        
+        team_pk = dict(session.execute(select(Team.team_id, Team.id)).all())
+        ingested_ids = _upsert_player_stats(session, stats_data, team_pk, season, season_type)
+        ingested_stats = _player_stats_result(
+            session, ingested_ids, season, season_type, return_count
+        )
+        
+        # Callers that pass their own session own the transaction
+        if should_close:
+            session.commit()
+        else:
+            session.flush()
+        log.info("Ingested player stats for %d players", len(ingested_ids))
+        
+        return ingested_stats
+        
+    except Exception:
+        if should_close:
+            session.rollback()
+        log.exception("ingest_player_stats failed for %s %s", season, season_type)
+        raise
+    finally:
+        if should_close:
+            session.close()
 
 
-def ingest_player_stats(season: int, season_type: str = "Regular Season",
-                       team_id: Optional[str] = None, session: Session = None) -> List[PlayerSeasonStats]:
+def _upsert_player_stats(session: Session, stats_data: Iterable[Dict[str, Any]],
+                         team_pk: Dict[str, int], season: int,
+                         season_type: str) -> List[int]:
     """
-    Ingest player statistics from NBA API.
+    Upsert player season stats and return the player primary keys written.
+    
+    Args:
+        session: Database session
+        stats_data: Player statistics rows from the API, consumed in one pass
+        team_pk: Team primary keys by NBA team id
+        season: Season year
+        season_type: Season type
+        
+    Returns:
+        Primary keys of the players whose stats were written.
+    """
+    # Keyed by NBA player id so a repeated player in the payload is written
+    # once; each raw row is converted and released as it is read
+    mappings_by_nba_id = {}
+    
+    for stat_data in stats_data:
+        # Get team reference
+        team_id = None
+        if stat_data.get("TEAM_ID"):
+            team_id = team_pk.get(str(stat_data["TEAM_ID"]))
+        
+        mapping = player_stats_mapping_from_data(stat_data, None, team_id, season, season_type)
+        if mapping:
+            mappings_by_nba_id[str(stat_data.get("PLAYER_ID", ""))] = mapping
+    
+    # Resolve API ids in one query instead of a SELECT per row; only the key
+    # columns of the players present in the payload are loaded
+    player_pk = dict(
+        session.execute(
+            select(Player.player_id, Player.id).where(
+                Player.player_id.in_(list(mappings_by_nba_id))
+            )
+        ).all()
+    )
+    
+    rows = {}
+    for nba_player_id, mapping in mappings_by_nba_id.items():
+        # Get player reference
+        player_id = player_pk.get(nba_player_id)
+        
+        if player_id is None:
+            log.debug("Player not found for PLAYER_ID %s", nba_player_id)
+            continue
+        
+        mapping["player_id"] = player_id
+        rows[player_id] = mapping
+    
+    # INSERT ... ON CONFLICT against
+    # uq_player_season_stats_player_season_type, one statement per page;
+    # missing values keep what is already stored
+    for page in batched(rows.values(), STATS_PAGE_SIZE):
+        upsert_rows(
+            session,
+            PlayerSeasonStats,
+            page,
+            index_elements=["player_id", "season", "season_type"],
+            keep_existing_on_null=True
+        )
+    return list(rows)
+
+
+def _player_stats_result(session: Session, player_ids: List[int], season: int,
+                         season_type: str,
+                         return_count: bool) -> Union[List[PlayerSeasonStats], int]:
+    """Load the written PlayerSeasonStats, or just count them when return_count is set."""
+    if return_count:
+        return len(player_ids)
+    
+    # populate_existing refreshes any instances already in the identity map
+    return session.query(PlayerSeasonStats).filter(
+        PlayerSeasonStats.season == season,
+        PlayerSeasonStats.season_type == season_type,
+        PlayerSeasonStats.player_id.in_(player_ids)
+    ).populate_existing().all()
+
+
+def ingest_all_player_stats(season: int, season_type: str = "Regular Season",
+                            session: Session = None, *,
+                            max_workers: int = 4,
+                            force_refresh: bool = False,
+                            return_count: bool = False) -> Union[List[PlayerSeasonStats], int]:
+    """
+    Ingest player statistics for every team, one request per team.
+    
+    Per-team requests for all teams in the database run concurrently on a
+    thread pool (the client spaces request starts to respect the API rate
+    limit); the combined rows are then written in one bulk upsert.
     
     Args:
         season: NBA season year (e.g., 2023 for 2023-24 season)
         season_type: Season type ('Regular Season', 'Playoffs', etc.)
-        team_id: Specific team ID to ingest stats for
         session: Database session. If None, creates a new session.
+        max_workers: Maximum concurrent stats requests.
+        force_refresh: Drop cached API responses for the endpoint and fetch
+            fresh data (only matters when requests-cache is installed).
+        return_count: Return only the number of rows written, without loading
+            the PlayerSeasonStats objects.
         
     Returns:
-        List of ingested PlayerSeasonStats objects.
+        List of ingested PlayerSeasonStats objects, or their count when
+        return_count is set.
     """
-    client = NBAAPIClient()
+    client = get_client()
     
     # Use provided session or create new one
     if session is None:
@@ -212,166 +419,135 @@ def ingest_player_stats(season: int, season_type: str = "Regular Season",
         should_close = False
     
     try:
-        # Fetch player stats from API
-        stats_data = client.get_player_stats(season, season_type, team_id)
+        team_pk = dict(session.execute(select(Team.team_id, Team.id)).all())
+        if not team_pk:
+            log.warning("No teams found; run ingest-teams first")
+            return 0 if return_count else []
         
-        ingested_stats = []
+        # Invalidate once up front rather than from every worker
+        if force_refresh:
+            drop_cached_responses("leaguedashplayerstats")
         
-        for stat_data in stats_data:
-            # Get player reference
-            player = session.query(Player).filter(
-                Player.player_id == str(stat_data.get("PLAYER_ID", ""))
-            ).first()
-            
-            if not player:
-                print(f"Player not found for PLAYER_ID: {stat_data.get('PLAYER_ID')}")
-                continue
-            
-            # Get team reference
-            team = None
-            if stat_data.get("TEAM_ID"):
-                team = session.query(Team).filter(
-                    Team.team_id == str(stat_data["TEAM_ID"])
-                ).first()
-            
-            # Check if stats already exist
-            existing_stats = session.query(PlayerSeasonStats).filter(
-                PlayerSeasonStats.player_id == player.id,
-                PlayerSeasonStats.season == season,
-                PlayerSeasonStats.season_type == season_type
-            ).first()
-            
-            if existing_stats:
-                # Update existing stats
-                update_player_stats(existing_stats, stat_data)
-                ingested_stats.append(existing_stats)
-            else:
-                # Create new stats
-                player_stats = create_player_stats_from_data(stat_data, player, team, season, season_type)
-                if player_stats:
-                    session.add(player_stats)
-                    ingested_stats.append(player_stats)
-        
-        session.commit()
-        print(f"Successfully ingested player stats for {len(ingested_stats)} players")
+        # Stats fetches are network-bound; the session stays on this thread.
+        # Each worker drains its own stream so the request runs in the pool.
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(team_pk))) as executor:
+            futures = [
+                executor.submit(
+                    lambda nba_team_id: list(
+                        client.iter_player_stats(season, season_type, nba_team_id)
+                    ),
+                    nba_team_id
+                )
+                for nba_team_id in team_pk
+            ]
+            stats_data = chain.from_iterable(future.result() for future in as_completed(futures))
+            ingested_ids = _upsert_player_stats(session, stats_data, team_pk, season, season_type)
+        
+        ingested_stats = _player_stats_result(
+            session, ingested_ids, season, season_type, return_count
+        )
+        
+        # Callers that pass their own session own the transaction
+        if should_close:
+            session.commit()
+        else:
+            session.flush()
+        log.info("Ingested player stats for %d players from %d teams",
+                 len(ingested_ids), len(team_pk))
         
         return ingested_stats
         
-    except Exception as e:
-        session.rollback()
-        print(f"Error ingesting player stats: {e}")
+    except Exception:
+        if should_close:
+            session.rollback()
+        log.exception("ingest_all_player_stats failed for %s %s", season, season_type)
         raise
     finally:
         if should_close:
             session.close()
 
 
-def create_player_stats_from_data(stat_data: Dict[str, Any], player: Player, team: Optional[Team],
-                                 season: int, season_type: str) -> Optional[PlayerSeasonStats]:
+def ingest_season(season: int, season_type: str = "Regular Season",
+                  session: Session = None, *,
+                  force_refresh: bool = False,
+                  return_count: bool = False) -> Tuple[Union[List[TeamStats], int],
+                                                       Union[List[PlayerSeasonStats], int]]:
     """
-    Create a PlayerSeasonStats object from API data.
+    Ingest team and player statistics for a season in one transaction.
+    
+    Both ingests share the session and only flush; a single commit follows
+    once both succeed, so a failure in either leaves nothing written.
     
     Args:
-        stat_data: Player statistics data from API
-        player: Player object
-        team: Team object (optional)
-        season: Season year
-        season_type: Season type
+        season: NBA season year (e.g., 2023 for 2023-24 season)
+        season_type: Season type ('Regular Season', 'Playoffs', etc.)
+        session: Database session. If None, creates a new session.
+        force_refresh: Drop cached API responses for the endpoints and fetch
+            fresh data (only matters when requests-cache is installed).
+        return_count: Return only the number of rows written, without loading
+            the stats objects.
         
     Returns:
-        PlayerSeasonStats object or None if invalid data.
+        Tuple of the ingested TeamStats and PlayerSeasonStats objects, or of
+        their counts when return_count is set.
     """
+    # Use provided session or create new one
+    if session is None:
+        session_factory = get_session_factory()
+        session = session_factory()
+        should_close = True
+    else:
+        should_close = False
+    
     try:
-        def safe_float(value):
-            try:
-                return float(value) if value is not None else None
-            except (ValueError, TypeError):
-                return None
-        
-        def safe_int(value):
-            try:
-                return int(value) if value is not None else None
-            except (ValueError, TypeError):
-                return None
-        
-        player_stats = PlayerSeasonStats(
-            player_id=player.id,
-            team_id=team.id if team else None,
-            season=season,
-            season_type=season_type,
-            games_played=safe_int(stat_data.get("GP")),
-            games_started=safe_int(stat_data.get("GS")),
-            minutes_per_game=safe_float(stat_data.get("MIN")),
-            points_per_game=safe_float(stat_data.get("PTS")),
-            rebounds_per_game=safe_float(stat_data.get("REB")),
-            assists_per_game=safe_float(stat_data.get("AST")),
-            steals_per_game=safe_float(stat_data.get("STL")),
-            blocks_per_game=safe_float(stat_data.get("BLK")),
-            turnovers_per_game=safe_float(stat_data.get("TOV")),
-            personal_fouls_per_game=safe_float(stat_data.get("PF")),
-            field_goal_percentage=safe_float(stat_data.get("FG_PCT")),
-            three_point_percentage=safe_float(stat_data.get("FG3_PCT")),
-            free_throw_percentage=safe_float(stat_data.get("FT_PCT")),
-            true_shooting_percentage=safe_float(stat_data.get("TS_PCT")),
-            effective_field_goal_percentage=safe_float(stat_data.get("EFG_PCT")),
-            offensive_rebound_percentage=safe_float(stat_data.get("OREB_PCT")),
-            defensive_rebound_percentage=safe_float(stat_data.get("DREB_PCT")),
-            assist_percentage=safe_float(stat_data.get("AST_PCT")),
-            turnover_percentage=safe_float(stat_data.get("TOV_PCT")),
-            usage_percentage=safe_float(stat_data.get("USG_PCT")),
-            player_efficiency_rating=safe_float(stat_data.get("PER"))
+        team_stats = ingest_team_stats(
+            season, season_type, session=session,
+            force_refresh=force_refresh, return_count=return_count
         )
+        player_stats = ingest_player_stats(
+            season, season_type, session=session,
+            force_refresh=force_refresh, return_count=return_count
+        )
+        
+        # Callers that pass their own session own the transaction
+        if should_close:
+            session.commit()
         
-        return player_stats
+        return team_stats, player_stats
         
-    except Exception as e:
-        print(f"Error creating player stats from data: {e}")
-        return None
+    except Exception:
+        if should_close:
+            session.rollback()
+        raise
+    finally:
+        if should_close:
+            session.close()
 
 
-def update_player_stats(player_stats: PlayerSeasonStats, stat_data: Dict[str, Any]) -> None:
+def player_stats_mapping_from_data(stat_data: Dict[str, Any], player_id: Optional[int], team_id: Optional[int],
+                                   season: int, season_type: str) -> Optional[Dict[str, Any]]:
     """
-    Update existing player stats with new data.
+    Build a PlayerSeasonStats column mapping from API data.
     
     Args:
-        player_stats: Existing PlayerSeasonStats object
-        stat_data: New statistics data from API
+        stat_data: Player statistics data from API
+        player_id: Primary key of the player, if already resolved
+        team_id: Primary key of the team (optional)
+        season: Season year
+        season_type: Season type
+        
+    Returns:
+        Column mapping for PlayerSeasonStats or None if invalid data.
     """
     try:
-        def safe_float(value):
-            try:
-                return float(value) if value is not None else None
-            except (ValueError, TypeError):
-                return None
-        
-        def safe_int(value):
-            try:
-                return int(value) if value is not None else None
-            except (ValueError, TypeError):
-                return None
-        
-        # Update all fields
-        player_stats.games_played = safe_int(stat_data.get("GP")) or player_stats.games_played
-        player_stats.games_started = safe_int(stat_data.get("GS")) or player_stats.games_started
-        player_stats.minutes_per_game = safe_float(stat_data.get("MIN")) or player_stats.minutes_per_game
-        player_stats.points_per_game = safe_float(stat_data.get("PTS")) or player_stats.points_per_game
-        player_stats.rebounds_per_game = safe_float(stat_data.get("REB")) or player_stats.rebounds_per_game
-        player_stats.assists_per_game = safe_float(stat_data.get("AST")) or player_stats.assists_per_game
-        player_stats.steals_per_game = safe_float(stat_data.get("STL")) or player_stats.steals_per_game
-        player_stats.blocks_per_game = safe_float(stat_data.get("BLK")) or player_stats.blocks_per_game
-        player_stats.turnovers_per_game = safe_float(stat_data.get("TOV")) or player_stats.turnovers_per_game
-        player_stats.personal_fouls_per_game = safe_float(stat_data.get("PF")) or player_stats.personal_fouls_per_game
-        player_stats.field_goal_percentage = safe_float(stat_data.get("FG_PCT")) or player_stats.field_goal_percentage
-        player_stats.three_point_percentage = safe_float(stat_data.get("FG3_PCT")) or player_stats.three_point_percentage
-        player_stats.free_throw_percentage = safe_float(stat_data.get("FT_PCT")) or player_stats.free_throw_percentage
-        player_stats.true_shooting_percentage = safe_float(stat_data.get("TS_PCT")) or player_stats.true_shooting_percentage
-        player_stats.effective_field_goal_percentage = safe_float(stat_data.get("EFG_PCT")) or player_stats.effective_field_goal_percentage
-        player_stats.offensive_rebound_percentage = safe_float(stat_data.get("OREB_PCT")) or player_stats.offensive_rebound_percentage
-        player_stats.defensive_rebound_percentage = safe_float(stat_data.get("DREB_PCT")) or player_stats.defensive_rebound_percentage
-        player_stats.assist_percentage = safe_float(stat_data.get("AST_PCT")) or player_stats.assist_percentage
-        player_stats.turnover_percentage = safe_float(stat_data.get("TOV_PCT")) or player_stats.turnover_percentage
-        player_stats.usage_percentage = safe_float(stat_data.get("USG_PCT")) or player_stats.usage_percentage
-        player_stats.player_efficiency_rating = safe_float(stat_data.get("PER")) or player_stats.player_efficiency_rating
-        
-    except Exception as e:
-        print(f"Error updating player stats: {e}")
+        return {
+            **_stats_values(stat_data, PLAYER_STATS_FIELDS),
+            "player_id": player_id,
+            "team_id": team_id,
+            "season": season,
+            "season_type": season_type,
+        }
+        
+    except Exception:
+        log.exception("Error creating player stats from data")
+        return None
@@ -2,12 +2,22 @@
 Team data ingestion for NBA
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
 from nba.db.session import get_session_factory
 from nba.db.models import Team
-from nba.sources.nba_api_client_fixed import NBAAPIClientFixed as NBAAPIClient
+from nba.sources.nba_api_client_fixed import get_client
+
+
+# Team abbreviation -> primary key, filled by get_team_by_abbreviation from
+# committed rows only and cleared by ingest_teams
+_team_pks: Dict[str, int] = {}
+
+# Columns an API refresh may overwrite on an existing team; the same set the
+# insert path copies, so unexpected payload keys are never assigned
+_TEAM_UPDATE_FIELDS = ("name", "abbreviation", "city", "state", "conference", "division")
 
 
 def ingest_teams(session: Session = None) -> List[Team]:
@@ -20,7 +30,7 @@ def ingest_teams(session: Session = None) -> List[Team]:
     Returns:
         List of ingested Team objects.
     """
-    client = NBAAPIClient()
+    client = get_client()
     
     # Use provided session or create new one
     if session is None:
@@ -35,40 +45,66 @@ def ingest_teams(session: Session = None) -> List[Team]:
         teams_data = client.get_teams()
         
         ingested_teams = []
+        new_rows = []
+        
+        # Load existing teams in one query instead of one lookup per row
+        existing_by_id = {
+            team.team_id: team
+            for team in session.scalars(
+                select(Team).where(
+                    Team.team_id.in_([team_data["team_id"] for team_data in teams_data])
+                )
+            )
+        }
         
         for team_data in teams_data:
-            # Check if team already exists
-            existing_team = session.query(Team).filter(
-                Team.team_id == team_data["team_id"]
-            ).first()
+            existing_team = existing_by_id.get(team_data["team_id"])
             
             if existing_team:
-                # Update existing team
-                for key, value in team_data.items():
-                    if hasattr(existing_team, key):
-                        setattr(existing_team, key, value)
+                # Update existing team; missing values keep what is stored
+                for field in _TEAM_UPDATE_FIELDS:
+                    value = team_data.get(field)
+                    if value is not None:
+                        setattr(existing_team, field, value)
                 ingested_teams.append(existing_team)
             else:
-                # Create new team
-                team = Team(
-                    team_id=team_data["team_id"],
-                    name=team_data["name"],
-                    abbreviation=team_data["abbreviation"],
-                    city=team_data.get("city"),
-                    state=team_data.get("state"),
-                    conference=team_data.get("conference"),
-                    division=team_data.get("division")
+                new_rows.append({
+                    "team_id": team_data["team_id"],
+                    "name": team_data["name"],
+                    "abbreviation": team_data["abbreviation"],
+                    "city": team_data.get("city"),
+                    "state": team_data.get("state"),
+                    "conference": team_data.get("conference"),
+                    "division": team_data.get("division")
+                })
+        
+        if new_rows:
+            # Single executemany INSERT; OR IGNORE keeps re-runs idempotent on SQLite
+            session.execute(
+                insert(Team).prefix_with("OR IGNORE", dialect="sqlite"),
+                new_rows
+            )
+            ingested_teams.extend(
+                session.scalars(
+                    select(Team).where(
+                        Team.team_id.in_([row["team_id"] for row in new_rows])
+                    )
                 )
-                session.add(team)
-                ingested_teams.append(team)
+            )
         
-        session.commit()
+        # Callers that pass their own session own the transaction
+        if should_close:
+            session.commit()
+        else:
+            session.flush()
+        _team_pks.clear()
         print(f"Successfully ingested {len(ingested_teams)} teams")
         
         return ingested_teams
         
     except Exception as e:
-        session.rollback()
+        if should_close:
+            session.rollback()
         print(f"Error ingesting teams: {e}")
         raise
     finally:
@@ -76,10 +112,15 @@ def ingest_teams(session: Session = None) -> List[Team]:
             session.close()
 
 
-def get_team_by_abbreviation(abbreviation: str, session: Session = None) -> Team:
+def get_team_by_abbreviation(abbreviation: str, session: Session = None) -> Optional[Team]:
     """
     Get team by abbreviation.
     
+    Abbreviation to primary key pairs read through a fresh session (so from
+    committed data) are remembered; repeat lookups then resolve through
+    session.get() and the identity map. Every lookup, cached or not, goes
+    through the given session.
+    
     Args:
         abbreviation: Team abbreviation (e.g., 'LAL', 'BOS')
         session: Database session. If None, creates a new session.
@@ -95,25 +136,52 @@ def get_team_by_abbreviation(abbreviation: str, session: Session = None) -> Team
         should_close = False
     
     try:
-        team = session.query(Team).filter(
-            Team.abbreviation == abbreviation.upper()
-        ).first()
+        abbreviation = abbreviation.upper()
+        team_pk = _team_pks.get(abbreviation)
+        if team_pk is not None:
+            team = session.get(Team, team_pk)
+            # Another writer may have removed or renamed the team since
+            if team is not None and team.abbreviation == abbreviation:
+                return team
+        
+        team = session.scalar(
+            select(Team).where(Team.abbreviation == abbreviation).limit(1)
+        )
+        # A caller's session may see its own uncommitted rows, which must not
+        # outlive its transaction in a process-wide cache
+        if team is not None and should_close:
+            _team_pks[abbreviation] = team.id
         return team
     finally:
         if should_close:
             session.close()
 
 
-def get_all_teams(session: Session = None) -> List[Team]:
+# Columns returned by get_all_teams unless the caller asks for others
+DEFAULT_TEAM_COLUMNS = (
+    Team.id,
+    Team.team_id,
+    Team.abbreviation,
+    Team.name,
+)
+
+
+def get_all_teams(session: Session = None, *,
+                  columns: Optional[Sequence[Any]] = None) -> List[Any]:
     """
     Get all teams from database.
     
     Args:
         session: Database session. If None, creates a new session.
+        columns: Columns to select. Defaults to DEFAULT_TEAM_COLUMNS; pass
+            [Team] to get full Team objects.
         
     Returns:
-        List of all Team objects.
+        List of rows with the selected columns, or plain values when a
+        single column or entity is selected.
     """
+    columns = list(columns) if columns is not None else list(DEFAULT_TEAM_COLUMNS)
+    
     if session is None:
         session_factory = get_session_factory()
         session = session_factory()
@@ -122,8 +190,10 @@ def get_all_teams(session: Session = None) -> List[Team]:
         should_close = False
     
     try:
-        teams = session.query(Team).all()
-        return teams
+        result = session.execute(select(*columns))
+        if len(columns) == 1:
+            return result.scalars().all()
+        return result.all()
     finally:
         if should_close:
             session.close()
@@ -5,15 +5,23 @@ This module provides various authentication methods for NBA API access.
 NBA.com uses different authentication approaches depending on the endpoint.
 """
 
+import logging
 import os
+import tempfile
+import threading
 import time
 import json
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 import requests
 from pathlib import Path
 
-from nba.config import get_settings
+from nba.config import get_settings, load_env
+
+
+log = logging.getLogger(__name__)
 
 
 @dataclass
@@ -34,12 +42,17 @@ class NBAAPIAuth:
     # Browser-like headers for web scraping
     use_browser_headers: bool = True
     
-    # Rate limiting
+    # Rate limiting; requests are paced to max_requests_per_minute by the
+    # rate_policy limiter ("token_bucket" or "sliding_window").
+    # rate_limit_delay is no longer consulted.
     rate_limit_delay: float = 1.0
     max_requests_per_minute: int = 60
+    rate_policy: str = "token_bucket"
     
     def __post_init__(self) -> None:
         """Initialize authentication from environment variables."""
+        load_env()
+        
         if self.api_key is None:
             self.api_key = os.getenv("NBA_API_KEY")
         
@@ -53,13 +66,102 @@ class NBAAPIAuth:
             self.access_token = os.getenv("NBA_ACCESS_TOKEN")
 
 
+class TokenBucketRateLimiter:
+    """
+    Token-bucket request limiter.
+    
+    Tokens refill continuously at refill_rate per second up to capacity and
+    each request takes one, so idle time builds up burst credit and a caller
+    only sleeps once the bucket is empty. Safe to share between threads.
+    """
+    
+    def __init__(self, capacity: float, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def per_minute(cls, max_requests_per_minute: int) -> "TokenBucketRateLimiter":
+        """Build a bucket allowing max_requests_per_minute with a burst of the same size."""
+        return cls(capacity=max_requests_per_minute, refill_rate=max_requests_per_minute / 60)
+    
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.refill_rate)
+        self._last_refill = now
+    
+    def acquire(self) -> None:
+        """Take one token, sleeping only as long as it takes to refill one."""
+        # The wait is computed under the lock but slept outside it, so other
+        # threads can check the bucket meanwhile; re-check after waking since
+        # another thread may have taken the refilled token
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.refill_rate
+            time.sleep(wait)
+
+
+class SlidingWindowRateLimiter:
+    """
+    Sliding-window request limiter.
+    
+    Allows at most max_requests request starts in any window_seconds span,
+    matching a server that counts requests over a rolling window; unlike a
+    token bucket it cannot burst across a window edge. Safe to share
+    between threads.
+    """
+    
+    def __init__(self, max_requests: int, window_seconds: float = 60.0):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self._starts = deque(maxlen=max_requests)
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Record a request start, sleeping until the window has room for it."""
+        # Sleep outside the lock so other threads aren't blocked on it, then
+        # re-check: another thread may have taken the freed slot
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._starts and self._starts[0] <= now - self.window_seconds:
+                    self._starts.popleft()
+                if len(self._starts) < self.max_requests:
+                    self._starts.append(now)
+                    return
+                wait = self._starts[0] + self.window_seconds - now
+            time.sleep(wait)
+
+
+def _build_rate_limiter(auth: NBAAPIAuth):
+    """
+    Create the request limiter selected by auth.rate_policy.
+    
+    Args:
+        auth: Authentication configuration
+        
+    Returns:
+        Limiter exposing acquire().
+    """
+    if auth.rate_policy == "token_bucket":
+        return TokenBucketRateLimiter.per_minute(auth.max_requests_per_minute)
+    if auth.rate_policy == "sliding_window":
+        return SlidingWindowRateLimiter(auth.max_requests_per_minute, window_seconds=60.0)
+    raise ValueError(f"Unknown rate_policy: {auth.rate_policy!r}")
+
+
 class NBAAPIAuthenticator:
     """Handles NBA API authentication and session management."""
     
     def __init__(self, auth_config: Optional[NBAAPIAuth] = None):
         self.auth = auth_config or NBAAPIAuth()
         self.session = requests.Session()
-        self.last_request_time = 0.0
+        self.rate_limiter = _build_rate_limiter(self.auth)
         
         # Set up session headers
         self._setup_session_headers()
@@ -87,17 +189,13 @@ class NBAAPIAuthenticator:
             
         if self.auth.access_token:
             self.session.headers["Authorization"] = f"Bearer {self.auth.access_token}"
+            
+        if self.auth.session_token:
+            self.session.headers["X-Session-Token"] = self.auth.session_token
     
     def _rate_limit(self) -> None:
-        """Implement rate limiting between requests."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.auth.rate_limit_delay:
-            sleep_time = self.auth.rate_limit_delay - time_since_last
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+        """Wait for a request token from the rate limiter."""
+        self.rate_limiter.acquire()
     
     def authenticate_with_session(self, username: str, password: str) -> bool:
         """
@@ -123,11 +221,11 @@ class NBAAPIAuthenticator:
                     self.auth.session_id = cookies["sessionid"]
                 return True
             else:
-                print(f"Login failed: {response.status_code}")
+                log.warning("Login failed: %s", response.status_code)
                 return False
                 
-        except Exception as e:
-            print(f"Authentication error: {e}")
+        except Exception:
+            log.exception("Authentication error")
             return False
     
     def authenticate_with_api_key(self, api_key: str) -> bool:
@@ -136,19 +234,18 @@ class NBAAPIAuthenticator:
             self.auth.api_key = api_key
             self.session.headers["X-API-Key"] = api_key
             return True
-        except Exception as e:
-            print(f"API key authentication error: {e}")
+        except Exception:
+            log.exception("API key authentication error")
             return False
     
-    def get_authenticated_headers(self) -> Dict[str, str]:
-        """Get headers with current authentication."""
-        headers = self.session.headers.copy()
+    def get_authenticated_headers(self) -> Mapping[str, str]:
+        """
+        Get headers with current authentication.
         
-        # Add any additional authentication headers
-        if self.auth.session_token:
-            headers["X-Session-Token"] = self.auth.session_token
-            
-        return headers
+        Returns a read-only view of the session headers, which already carry
+        every authentication header, instead of a copy per call.
+        """
+        return MappingProxyType(self.session.headers)
     
     def test_authentication(self) -> bool:
         """Test if current authentication is working."""
@@ -168,15 +265,19 @@ class NBAAPIAuthenticator:
                 data = response.json()
                 return "resultSets" in data
             else:
-                print(f"Authentication test failed: {response.status_code}")
+                log.warning("Authentication test failed: %s", response.status_code)
                 return False
                 
         except Exception as e:
-            print(f"Authentication test error: {e}")
+            log.warning("Authentication test error: %s", e)
             return False
     
     def save_credentials(self, filepath: str = ".nba_credentials") -> None:
-        """Save authentication credentials to file (encrypted in production)."""
+        """
+        Save authentication credentials to file (encrypted in production).
+        
+        The file is replaced atomically and readable by the owner only.
+        """
         credentials = {
             "api_key": self.auth.api_key,
             "session_id": self.auth.session_id,
@@ -188,10 +289,22 @@ class NBAAPIAuthenticator:
         # Remove None values
         credentials = {k: v for k, v in credentials.items() if v is not None}
         
-        with open(filepath, 'w') as f:
-            json.dump(credentials, f, indent=2)
+        # Write a private temp file next to the target and swap it in, so a
+        # crash mid-write never leaves a truncated credentials file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filepath) or ".",
+                                        prefix=".nba_credentials.")
+        try:
+            # fdopen takes ownership of fd first, so it is closed even if
+            # chmod fails
+            with os.fdopen(fd, 'w') as f:
+                os.chmod(tmp_path, 0o600)
+                json.dump(credentials, f, indent=2)
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
         
-        print(f"Credentials saved to {filepath}")
+        log.info("Credentials saved to %s", filepath)
     
     def load_credentials(self, filepath: str = ".nba_credentials") -> bool:
         """Load authentication credentials from file."""
@@ -210,11 +323,11 @@ class NBAAPIAuthenticator:
             # Update session headers
             self._setup_session_headers()
             
-            print(f"Credentials loaded from {filepath}")
+            log.info("Credentials loaded from %s", filepath)
             return True
             
-        except Exception as e:
-            print(f"Error loading credentials: {e}")
+        except Exception:
+            log.exception("Error loading credentials")
             return False
 
 
@@ -272,6 +385,7 @@ def setup_authentication_interactive() -> NBAAPIAuthenticator:
         save = input("Save credentials for future use? (y/n): ").strip().lower()
         if save == 'y':
             authenticator.save_credentials()
+            print("✓ Credentials saved to .nba_credentials")
     else:
         print("⚠ Authentication test failed, but you can still try API calls")
         print("  NBA.com may block automated requests regardless of authentication")
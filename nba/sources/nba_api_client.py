@@ -7,36 +7,116 @@ which is a well-established, community-maintained package for NBA.com APIs.
 
 from __future__ import annotations
 
+import logging
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union
+from itertools import repeat
+from typing import Any, Dict, Iterable, List, Optional, Union
 from datetime import datetime, date
+import numpy as np
 import pandas as pd
 
-# nba_api imports
+from .auth import TokenBucketRateLimiter
+from .nba_api_client_fixed import (
+    _is_retryable, _static_players, _static_players_by_team, _static_teams, get_http_session
+)
+
+# Workers from get_many_player_career_stats log concurrently; if handlers
+# are slow, attach a QueueHandler at the root logger so they don't block them
+log = logging.getLogger(__name__)
+
+# nba_api imports. Endpoint modules are imported where they are used:
+# importing nba_api.stats.endpoints loads every endpoint the library ships,
+# which commands that only need static teams/players never touch.
 try:
-    from nba_api.stats.endpoints import (
-        commonteamroster,
-        leaguedashteamstats,
-        leaguedashplayerstats,
-        boxscoretraditionalv2,
-        leaguestandingsv3,
-        playercareerstats,
-        teamdashboardbyyearoveryear,
-        playerdashboardbyyearoveryear
-    )
     from nba_api.stats.static import players, teams
-    from nba_api.live.nba.endpoints import scoreboard as live_scoreboard
     NBA_API_AVAILABLE = True
 except ImportError as e:
-    print(f"Warning: Some NBA API endpoints not available: {e}")
+    log.warning("NBA API not available: %s", e)
     NBA_API_AVAILABLE = False
-    # Fallback imports
-    try:
-        from nba_api.stats.static import players, teams
-    except ImportError:
-        players = None
-        teams = None
+    players = None
+    teams = None
+
+
+# Output key -> (endpoint column, dtype, value for missing); a None dtype
+# copies the column unchanged, a None value for missing keeps missing
+# values as None and a None entry is filled by the caller
+STANDINGS_COLUMNS = {
+    "team_id": ("TeamID", str, None),
+    "team_name": ("TeamName", None, None),
+    "season": None,
+    "season_type": None,
+    "conference": ("Conference", None, None),
+    "division": ("Division", None, None),
+    "wins": ("WINS", int, 0),
+    "losses": ("LOSSES", int, 0),
+    "win_percentage": ("WinPCT", float, 0.0),
+    "games_back": ("GB", float, 0.0),
+    "conference_rank": ("ConferenceRank", int, 0),
+    "division_rank": ("DivisionRank", int, 0),
+}
+
+CAREER_STATS_COLUMNS = {
+    "season": ("SEASON_ID", None, None),
+    "team_id": ("TEAM_ID", str, None),
+    "team_name": ("TEAM_NAME", None, None),
+    "games_played": ("GP", int, 0),
+    "games_started": ("GS", int, 0),
+    "minutes_per_game": ("MIN", float, 0.0),
+    "points_per_game": ("PTS", float, 0.0),
+    "rebounds_per_game": ("REB", float, 0.0),
+    "assists_per_game": ("AST", float, 0.0),
+    "steals_per_game": ("STL", float, 0.0),
+    "blocks_per_game": ("BLK", float, 0.0),
+    "turnovers_per_game": ("TOV", float, 0.0),
+    "field_goal_percentage": ("FG_PCT", float, 0.0),
+    "three_point_percentage": ("FG3_PCT", float, 0.0),
+    "free_throw_percentage": ("FT_PCT", float, 0.0),
+}
+
+
+def _frame_records(df: pd.DataFrame, columns: Dict[str, Optional[tuple]],
+                   **constants: Any) -> List[Dict[str, Any]]:
+    """
+    Convert an endpoint DataFrame to dicts, casting a whole column at a time.
+    
+    Missing values are masked per column with NumPy instead of checked per
+    cell with pd.notna, and tolist() hands back plain Python values.
+    
+    Args:
+        df: Result set from an nba_api endpoint
+        columns: Output key -> (endpoint column, dtype, value for missing),
+            or None for a key taken from constants
+        **constants: Values repeated on every record
+        
+    Returns:
+        One dict per row with the keys in columns order.
+    """
+    values = []
+    for key, spec in columns.items():
+        if spec is None:
+            values.append(repeat(constants[key], len(df)))
+            continue
+        column, dtype, default = spec
+        array = df[column].to_numpy()
+        missing = pd.isna(array)
+        if default is not None:
+            if missing.any():
+                array = np.where(missing, default, array)
+            values.append(array.astype(dtype).tolist())
+            continue
+        column_values = array.tolist()
+        if missing.any():
+            column_values = [None if is_missing else value
+                             for value, is_missing in zip(column_values, missing.tolist())]
+        if dtype is not None:
+            column_values = [None if value is None else dtype(value) for value in column_values]
+        values.append(column_values)
+    
+    keys = list(columns)
+    return [dict(zip(keys, row)) for row in zip(*values)]
 
 
 @dataclass
@@ -46,10 +126,22 @@ class NBAAPIClient:
     rate_limit_sleep_seconds: float = 1.0
     timeout_seconds: int = 30
     max_retries: int = 3
+    max_backoff_seconds: float = 30.0
+    max_requests_per_minute: int = 60
+    max_concurrency: int = 8
+    
+    def __post_init__(self) -> None:
+        self._rate_limiter = TokenBucketRateLimiter.per_minute(self.max_requests_per_minute)
+        
+        # nba_api holds one HTTP session for the whole process; share the
+        # pooled (and, with requests-cache, caching) session that the fixed
+        # client installs rather than replacing it with a second one
+        if NBA_API_AVAILABLE:
+            get_http_session()
     
     def _rate_limit(self) -> None:
-        """Apply rate limiting between requests."""
-        time.sleep(self.rate_limit_sleep_seconds)
+        """Wait for a request token; bursts are allowed after idle time."""
+        self._rate_limiter.acquire()
     
     def _safe_api_call(self, api_call, *args, **kwargs) -> Any:
         """Safely make an API call with retry logic."""
@@ -59,129 +151,107 @@ class NBAAPIClient:
                 result = api_call(*args, **kwargs)
                 return result
             except Exception as e:
-                if attempt == self.max_retries - 1:
+                if attempt == self.max_retries - 1 or not _is_retryable(e):
                     raise e
-                print(f"API call failed (attempt {attempt + 1}/{self.max_retries}): {e}")
-                time.sleep(self.rate_limit_sleep_seconds * (attempt + 1))
+                log.warning("API call failed (attempt %d/%d): %s", attempt + 1, self.max_retries, e)
+                # Exponential backoff with full jitter so concurrent workers
+                # don't retry in lockstep
+                delay = min(self.max_backoff_seconds, self.rate_limit_sleep_seconds * 2 ** attempt)
+                time.sleep(random.uniform(0, delay))
     
     def get_teams(self, season: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Get all NBA teams using static data."""
+        """
+        Get all NBA teams using static data.
+        
+        The dicts are cached and shared between calls; treat them as read-only.
+        """
         try:
             # Use static teams data (more reliable)
             if teams is None:
-                print("Warning: Teams static data not available")
+                log.warning("Teams static data not available")
                 return []
-                
-            teams_data = teams.get_teams()
             
-            # Convert to our expected format
-            teams_list = []
-            for team in teams_data:
-                team_dict = {
-                    "team_id": str(team['id']),
-                    "name": team['full_name'],
-                    "abbreviation": team['abbreviation'],
-                    "city": team['city'],
-                    "state": team['state'],
-                    "conference": team.get('conference', ''),
-                    "division": team.get('division', '')
-                }
-                teams_list.append(team_dict)
-            
-            return teams_list
+            return list(_static_teams())
             
-        except Exception as e:
-            print(f"Error fetching teams: {e}")
+        except Exception:
+            log.exception("Error fetching teams")
             return []
     
     def get_players(self, season: Optional[int] = None, team_id: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get NBA players using static data."""
+        """
+        Get NBA players using static data, optionally for one team.
+        
+        The dicts are cached and shared between calls; treat them as read-only.
+        """
         try:
             # Use static players data
             if players is None:
-                print("Warning: Players static data not available")
+                log.warning("Players static data not available")
                 return []
-                
-            players_data = players.get_players()
-            
-            # Filter by active players if season is specified
-            if season:
-                players_data = [p for p in players_data if p.get('is_active', False)]
-            
-            # Convert to our expected format
-            players_list = []
-            for player in players_data:
-                player_dict = {
-                    "player_id": str(player['id']),
-                    "name": player['full_name'],
-                    "first_name": player['first_name'],
-                    "last_name": player['last_name'],
-                    "position": player.get('position', ''),
-                    "height": player.get('height', ''),
-                    "weight": player.get('weight', 0),
-                    "is_active": player.get('is_active', False),
-                    "team_id": str(player.get('team_id', '')) if player.get('team_id') else None
-                }
-                players_list.append(player_dict)
             
-            return players_list
+            # Only active players if season is specified
+            if team_id:
+                return list(_static_players_by_team(bool(season)).get(str(team_id), ()))
+            return list(_static_players(bool(season)))
             
-        except Exception as e:
-            print(f"Error fetching players: {e}")
+        except Exception:
+            log.exception("Error fetching players")
             return []
     
     def get_games(self, season: int, season_type: str = "Regular Season") -> List[Dict[str, Any]]:
         """Get NBA games for a specific season."""
         if not NBA_API_AVAILABLE:
-            print("Warning: NBA API endpoints not available, returning empty games list")
+            log.warning("NBA API endpoints not available, returning empty games list")
             return []
             
         try:
             # For now, return empty list since scoreboard endpoint has issues
             # TODO: Implement alternative method for getting games
-            print("Warning: Games endpoint temporarily disabled due to compatibility issues")
+            log.warning("Games endpoint temporarily disabled due to compatibility issues")
             return []
             
-        except Exception as e:
-            print(f"Error fetching games: {e}")
+        except Exception:
+            log.exception("Error fetching games")
             return []
     
     def get_team_stats(self, season: int, season_type: str = "Regular Season") -> List[Dict[str, Any]]:
         """Get team statistics for a specific season."""
         if not NBA_API_AVAILABLE:
-            print("Warning: NBA API endpoints not available, returning empty team stats")
+            log.warning("NBA API endpoints not available, returning empty team stats")
             return []
             
         try:
             # For now, return empty list due to compatibility issues
             # TODO: Implement alternative method for getting team stats
-            print("Warning: Team stats endpoint temporarily disabled due to compatibility issues")
+            log.warning("Team stats endpoint temporarily disabled due to compatibility issues")
             return []
             
-        except Exception as e:
-            print(f"Error fetching team stats: {e}")
+        except Exception:
+            log.exception("Error fetching team stats")
             return []
     
     def get_player_stats(self, season: int, season_type: str = "Regular Season") -> List[Dict[str, Any]]:
         """Get player statistics for a specific season."""
         if not NBA_API_AVAILABLE:
-            print("Warning: NBA API endpoints not available, returning empty player stats")
+            log.warning("NBA API endpoints not available, returning empty player stats")
             return []
             
         try:
             # For now, return empty list due to compatibility issues
             # TODO: Implement alternative method for getting player stats
-            print("Warning: Player stats endpoint temporarily disabled due to compatibility issues")
+            log.warning("Player stats endpoint temporarily disabled due to compatibility issues")
             return []
             
-        except Exception as e:
-            print(f"Error fetching player stats: {e}")
+        except Exception:
+            log.exception("Error fetching player stats")
             return []
     
     def get_standings(self, season: int, season_type: str = "Regular Season") -> List[Dict[str, Any]]:
         """Get NBA standings for a specific season."""
         try:
             # Use league standings endpoint
+            from nba_api.stats.endpoints import leaguestandingsv3
+            
             standings_data = self._safe_api_call(
                 leaguestandingsv3.LeagueStandingsV3,
                 season=f"{season}-{str(season + 1)[-2:]}",
@@ -192,33 +262,22 @@ class NBAAPIClient:
             if hasattr(standings_data, 'get_data_frames'):
                 df = standings_data.get_data_frames()[0]
                 
-                for _, row in df.iterrows():
-                    standing_dict = {
-                        "team_id": str(row['TeamID']),
-                        "team_name": row['TeamName'],
-                        "season": season,
-                        "season_type": season_type,
-                        "conference": row['Conference'],
-                        "division": row['Division'],
-                        "wins": int(row['WINS']) if pd.notna(row['WINS']) else 0,
-                        "losses": int(row['LOSSES']) if pd.notna(row['LOSSES']) else 0,
-                        "win_percentage": float(row['WinPCT']) if pd.notna(row['WinPCT']) else 0.0,
-                        "games_back": float(row['GB']) if pd.notna(row['GB']) else 0.0,
-                        "conference_rank": int(row['ConferenceRank']) if pd.notna(row['ConferenceRank']) else 0,
-                        "division_rank": int(row['DivisionRank']) if pd.notna(row['DivisionRank']) else 0
-                    }
-                    standings.append(standing_dict)
+                standings = _frame_records(
+                    df, STANDINGS_COLUMNS, season=season, season_type=season_type
+                )
             
             return standings
             
-        except Exception as e:
-            print(f"Error fetching standings: {e}")
+        except Exception:
+            log.exception("Error fetching standings")
             return []
     
     def get_player_career_stats(self, player_id: str) -> Dict[str, Any]:
         """Get career statistics for a specific player."""
         try:
             # Use player career stats endpoint
+            from nba_api.stats.endpoints import playercareerstats
+            
             career_data = self._safe_api_call(
                 playercareerstats.PlayerCareerStats,
                 player_id=player_id
@@ -227,43 +286,52 @@ class NBAAPIClient:
             if hasattr(career_data, 'get_data_frames'):
                 df = career_data.get_data_frames()[0]
                 
-                # Convert to list of dictionaries
-                career_stats = []
-                for _, row in df.iterrows():
-                    season_stats = {
-                        "season": row['SEASON_ID'],
-                        "team_id": str(row['TEAM_ID']) if pd.notna(row['TEAM_ID']) else None,
-                        "team_name": row['TEAM_NAME'] if pd.notna(row['TEAM_NAME']) else None,
-                        "games_played": int(row['GP']) if pd.notna(row['GP']) else 0,
-                        "games_started": int(row['GS']) if pd.notna(row['GS']) else 0,
-                        "minutes_per_game": float(row['MIN']) if pd.notna(row['MIN']) else 0.0,
-                        "points_per_game": float(row['PTS']) if pd.notna(row['PTS']) else 0.0,
-                        "rebounds_per_game": float(row['REB']) if pd.notna(row['REB']) else 0.0,
-                        "assists_per_game": float(row['AST']) if pd.notna(row['AST']) else 0.0,
-                        "steals_per_game": float(row['STL']) if pd.notna(row['STL']) else 0.0,
-                        "blocks_per_game": float(row['BLK']) if pd.notna(row['BLK']) else 0.0,
-                        "turnovers_per_game": float(row['TOV']) if pd.notna(row['TOV']) else 0.0,
-                        "field_goal_percentage": float(row['FG_PCT']) if pd.notna(row['FG_PCT']) else 0.0,
-                        "three_point_percentage": float(row['FG3_PCT']) if pd.notna(row['FG3_PCT']) else 0.0,
-                        "free_throw_percentage": float(row['FT_PCT']) if pd.notna(row['FT_PCT']) else 0.0
-                    }
-                    career_stats.append(season_stats)
-                
                 return {
                     "player_id": player_id,
-                    "career_stats": career_stats
+                    "career_stats": _frame_records(df, CAREER_STATS_COLUMNS)
                 }
             
             return {"player_id": player_id, "career_stats": []}
             
-        except Exception as e:
-            print(f"Error fetching player career stats: {e}")
+        except Exception:
+            log.exception("Error fetching player career stats")
             return {"player_id": player_id, "career_stats": []}
     
+    def get_many_player_career_stats(self, player_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get career statistics for several players concurrently.
+        
+        Requests run on up to max_concurrency threads sharing the pooled
+        session; the rate limiter still spaces their starts, so throughput
+        is bounded by max_requests_per_minute rather than by round-trip time.
+        
+        Args:
+            player_ids: NBA player IDs
+            
+        Returns:
+            get_player_career_stats results keyed by player ID, in input order.
+        """
+        player_ids = list(dict.fromkeys(player_ids))
+        if not player_ids:
+            return {}
+        
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(player_ids))) as executor:
+            futures = {
+                executor.submit(self.get_player_career_stats, player_id): player_id
+                for player_id in player_ids
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        
+        return {player_id: results[player_id] for player_id in player_ids}
+    
     def get_live_games(self) -> List[Dict[str, Any]]:
         """Get currently live NBA games."""
         try:
             # Use live scoreboard endpoint
+            from nba_api.live.nba.endpoints import scoreboard as live_scoreboard
+            
             live_data = self._safe_api_call(live_scoreboard.ScoreBoard)
             
             games = []
@@ -286,6 +354,6 @@ class NBAAPIClient:
             
             return games
             
-        except Exception as e:
-            print(f"Error fetching live games: {e}")
+        except Exception:
+            log.exception("Error fetching live games")
             return []
@@ -7,37 +7,330 @@ with NumPy compatibility issues resolved.
 
 from __future__ import annotations
 
+import logging
+import random
+import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union
-from datetime import datetime, date
-import pandas as pd
+from functools import lru_cache
+from itertools import repeat
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from datetime import datetime, date, timedelta
+from urllib.parse import urlparse
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# nba_api imports
+log = logging.getLogger(__name__)
+
+# nba_api imports. Endpoint modules are imported where they are used:
+# importing nba_api.stats.endpoints loads every endpoint the library ships,
+# which commands that only need static teams/players never touch.
 try:
-    from nba_api.stats.endpoints import (
-        commonteamroster,
-        leaguedashteamstats,
-        leaguedashplayerstats,
-        boxscoretraditionalv2,
-        leaguestandingsv3,
-        playercareerstats,
-        teamdashboardbyyearoveryear,
-        playerdashboardbyyearoveryear,
-        scoreboard
-    )
     from nba_api.stats.static import players, teams
-    from nba_api.live.nba.endpoints import scoreboard as live_scoreboard
+    from nba_api.stats.library.http import NBAStatsHTTP
     NBA_API_AVAILABLE = True
 except ImportError as e:
-    print(f"Warning: Some NBA API endpoints not available: {e}")
+    log.warning("NBA API not available: %s", e)
     NBA_API_AVAILABLE = False
-    # Fallback imports
-    try:
-        from nba_api.stats.static import players, teams
-    except ImportError:
-        players = None
-        teams = None
+    players = None
+    teams = None
+
+
+# Optional on-disk response cache; repeat fetches of the same endpoint and
+# parameters are served from SQLite instead of stats.nba.com
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+HTTP_CACHE_NAME = "nba_cache"
+HTTP_CACHE_EXPIRE_AFTER = timedelta(hours=12)
+
+# Response statuses both clients' _safe_api_call retry with jittered backoff,
+# 429 included; other HTTP errors fail at once
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Earliest monotonic time the next API request may start, shared by all
+# clients and threads
+_rate_limit_lock = threading.Lock()
+_next_request_at = 0.0
+
+
+@lru_cache(maxsize=1)
+def get_http_session() -> requests.Session:
+    """
+    Return the process-wide pooled HTTP session used for stats.nba.com calls.
+    
+    The session keeps connections alive across endpoint calls and is
+    installed into nba_api on first use. Connection errors on a stale
+    keep-alive socket are retried by the adapter; request-level retries stay
+    in NBAAPIClientFixed._safe_api_call. When requests-cache is installed
+    the session also caches GET responses on disk for
+    HTTP_CACHE_EXPIRE_AFTER.
+    """
+    if requests_cache is not None:
+        session = requests_cache.CachedSession(
+            HTTP_CACHE_NAME,
+            expire_after=HTTP_CACHE_EXPIRE_AFTER,
+            allowable_methods=("GET",)
+        )
+    else:
+        session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(connect=3, read=0, backoff_factor=0.5)
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    
+    if NBA_API_AVAILABLE and hasattr(NBAStatsHTTP, "set_session"):
+        NBAStatsHTTP.set_session(session)
+    return session
+
+
+def drop_cached_responses(endpoint: str) -> int:
+    """
+    Remove cached responses for one stats endpoint, whatever their parameters.
+    
+    Args:
+        endpoint: Endpoint name, e.g. 'leaguedashteamstats'
+        
+    Returns:
+        Number of responses removed; always 0 without requests-cache.
+    """
+    cache = getattr(get_http_session(), "cache", None)
+    if cache is None:
+        return 0
+    
+    suffix = f"/{endpoint.lower()}"
+    keys = [
+        response.cache_key
+        for response in cache.filter()
+        if urlparse(response.url).path.lower().rstrip("/").endswith(suffix)
+    ]
+    if keys:
+        cache.delete(*keys)
+    return len(keys)
+
+
+# Column converters for the schema tables below. Missing numbers arrive as
+# None in the JSON, so "or 0" replaces a per-cell NaN check.
+def _int(value: Any) -> int:
+    return int(value or 0)
+
+
+def _float(value: Any) -> float:
+    return float(value or 0.0)
+
+
+def _optional_str(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _or_blank(value: Any) -> Any:
+    return value or ""
+
+
+def _or_zero(value: Any) -> Any:
+    return value or 0
+
+
+def _roster_birth_date(value: Optional[str]) -> Optional[str]:
+    """Convert a roster BIRTH_DATE such as 'SEP 19, 1998' to ISO format."""
+    return datetime.strptime(value, "%b %d, %Y").date().isoformat() if value else None
+
+
+# Output key -> (result set header, converter) for the get_* methods. A None
+# converter copies the value unchanged; a None header marks a value passed
+# to _convert_rows by the caller.
+TEAM_STATS_SCHEMA = (
+    ("team_id", "TEAM_ID", str),
+    ("team_name", "TEAM_NAME", None),
+    ("season", None, None),
+    ("season_type", None, None),
+    ("games_played", "GP", _int),
+    ("wins", "W", _int),
+    ("losses", "L", _int),
+    ("win_percentage", "W_PCT", _float),
+    ("points_per_game", "PTS", _float),
+    ("rebounds_per_game", "REB", _float),
+    ("assists_per_game", "AST", _float),
+    ("steals_per_game", "STL", _float),
+    ("blocks_per_game", "BLK", _float),
+    ("turnovers_per_game", "TOV", _float),
+    ("field_goal_percentage", "FG_PCT", _float),
+    ("three_point_percentage", "FG3_PCT", _float),
+    ("free_throw_percentage", "FT_PCT", _float),
+)
+
+PLAYER_STATS_SCHEMA = (
+    ("player_id", "PLAYER_ID", str),
+    ("player_name", "PLAYER_NAME", None),
+    ("team_id", "TEAM_ID", _optional_str),
+    ("team_name", "TEAM_NAME", _or_blank),
+    ("season", None, None),
+    ("season_type", None, None),
+    ("games_played", "GP", _int),
+    ("games_started", "GS", _int),
+    ("minutes_per_game", "MIN", _float),
+    ("points_per_game", "PTS", _float),
+    ("rebounds_per_game", "REB", _float),
+    ("assists_per_game", "AST", _float),
+    ("steals_per_game", "STL", _float),
+    ("blocks_per_game", "BLK", _float),
+    ("turnovers_per_game", "TOV", _float),
+    ("field_goal_percentage", "FG_PCT", _float),
+    ("three_point_percentage", "FG3_PCT", _float),
+    ("free_throw_percentage", "FT_PCT", _float),
+)
+
+STANDINGS_SCHEMA = (
+    ("team_id", "TeamID", str),
+    ("team_name", "TeamName", None),
+    ("season", None, None),
+    ("season_type", None, None),
+    ("conference", "Conference", None),
+    ("division", "Division", None),
+    ("wins", "WINS", _int),
+    ("losses", "LOSSES", _int),
+    ("win_percentage", "WinPCT", _float),
+    ("games_back", "GB", _float),
+    ("conference_rank", "ConferenceRank", _int),
+    ("division_rank", "DivisionRank", _int),
+)
+
+CAREER_STATS_SCHEMA = (
+    ("season", "SEASON_ID", None),
+    ("team_id", "TEAM_ID", _optional_str),
+    ("team_name", "TEAM_NAME", None),
+    ("games_played", "GP", _int),
+    ("games_started", "GS", _int),
+    ("minutes_per_game", "MIN", _float),
+    ("points_per_game", "PTS", _float),
+    ("rebounds_per_game", "REB", _float),
+    ("assists_per_game", "AST", _float),
+    ("steals_per_game", "STL", _float),
+    ("blocks_per_game", "BLK", _float),
+    ("turnovers_per_game", "TOV", _float),
+    ("field_goal_percentage", "FG_PCT", _float),
+    ("three_point_percentage", "FG3_PCT", _float),
+    ("free_throw_percentage", "FT_PCT", _float),
+)
+
+ROSTER_SCHEMA = (
+    ("player_id", "PLAYER_ID", str),
+    ("name", "PLAYER", None),
+    ("position", "POSITION", _or_blank),
+    ("height", "HEIGHT", _or_blank),
+    ("weight", "WEIGHT", _or_zero),
+    ("birth_date", "BIRTH_DATE", _roster_birth_date),
+    ("college", "SCHOOL", None),
+    ("jersey_number", "NUM", None),
+    ("is_active", None, None),
+    ("team_id", "TeamID", str),
+)
+
+
+def _convert_rows(rows: List[List[Any]], idx: Dict[str, int], schema,
+                  **constants: Any) -> List[Dict[str, Any]]:
+    """
+    Convert raw result set rows to output dicts, one column at a time.
+    
+    Each column is pulled out of the rows and converted with a single map()
+    instead of looking up the schema and header for every cell.
+    
+    Args:
+        rows: rowSet of the result set
+        idx: Result set header -> position in each row
+        schema: (output key, result set header, converter) table
+        **constants: Values for the None-header keys, repeated on every row
+        
+    Returns:
+        One dict per row with the keys in schema order.
+    """
+    if not rows:
+        return []
+    
+    columns = []
+    for key, header, convert in schema:
+        if header is None:
+            columns.append(repeat(constants[key], len(rows)))
+            continue
+        position = idx[header]
+        values = [row[position] for row in rows]
+        columns.append(values if convert is None else list(map(convert, values)))
+    
+    keys = [key for key, _, _ in schema]
+    return [dict(zip(keys, values)) for values in zip(*columns)]
+
+
+def _optional_ints(values: np.ndarray) -> List[Optional[int]]:
+    """Convert a float column to ints, with None where the value is NaN."""
+    missing = np.isnan(values).tolist()
+    return [None if is_missing else value for value, is_missing
+            in zip(np.nan_to_num(values).astype(int).tolist(), missing)]
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether a failed call may succeed on retry; HTTP errors such as 400 or 404 won't."""
+    status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return status_code is None or status_code in RETRY_STATUSES
+
+
+@lru_cache(maxsize=None)
+def _static_teams() -> Tuple[Dict[str, Any], ...]:
+    """nba_api's static teams converted to team dicts, built once per process."""
+    return tuple(
+        {
+            "team_id": str(team['id']),
+            "name": team['full_name'],
+            "abbreviation": team['abbreviation'],
+            "city": team['city'],
+            "state": team['state'],
+            "conference": team.get('conference', ''),
+            "division": team.get('division', '')
+        }
+        for team in teams.get_teams()
+    )
+
+
+@lru_cache(maxsize=None)
+def _static_players(active_only: bool) -> Tuple[Dict[str, Any], ...]:
+    """nba_api's static players converted to player dicts, built once per variant."""
+    return tuple(
+        {
+            "player_id": str(player['id']),
+            "name": player['full_name'],
+            "first_name": player['first_name'],
+            "last_name": player['last_name'],
+            "position": player.get('position', ''),
+            "height": player.get('height', ''),
+            "weight": player.get('weight', 0),
+            "is_active": player.get('is_active', False),
+            "team_id": str(player.get('team_id', '')) if player.get('team_id') else None
+        }
+        for player in players.get_players()
+        if not active_only or player.get('is_active', False)
+    )
+
+
+@lru_cache(maxsize=None)
+def _static_players_by_team(active_only: bool) -> Dict[str, Tuple[Dict[str, Any], ...]]:
+    """_static_players grouped by NBA team ID, built once per variant."""
+    by_team: Dict[str, List[Dict[str, Any]]] = {}
+    for player in _static_players(active_only):
+        if player["team_id"] is not None:
+            by_team.setdefault(player["team_id"], []).append(player)
+    return {team_id: tuple(team_players) for team_id, team_players in by_team.items()}
+
+
+@lru_cache(maxsize=None)
+def _season_str(season: int) -> str:
+    """Format a season start year the way stats.nba.com expects (2023 -> '2023-24')."""
+    return f"{season}-{str(season + 1)[-2:]}"
 
 
 @dataclass
@@ -47,10 +340,27 @@ class NBAAPIClientFixed:
     rate_limit_sleep_seconds: float = 1.0
     timeout_seconds: int = 30
     max_retries: int = 3
+    max_backoff_seconds: float = 30.0
+    
+    def __post_init__(self) -> None:
+        # Share one pooled, keep-alive HTTP session across all clients
+        get_http_session()
     
     def _rate_limit(self) -> None:
-        """Apply rate limiting between requests."""
-        time.sleep(self.rate_limit_sleep_seconds)
+        """
+        Apply rate limiting between requests.
+        
+        Request starts are spaced rate_limit_sleep_seconds apart across every
+        thread in the process, so thread-pool fan-outs overlap response
+        latency without bursting the API.
+        """
+        global _next_request_at
+        with _rate_limit_lock:
+            now = time.monotonic()
+            start_at = max(now, _next_request_at)
+            _next_request_at = start_at + self.rate_limit_sleep_seconds
+        if start_at > now:
+            time.sleep(start_at - now)
     
     def _safe_api_call(self, api_call, *args, **kwargs) -> Any:
         """Safely make an API call with retry logic."""
@@ -60,80 +370,134 @@ class NBAAPIClientFixed:
                 result = api_call(*args, **kwargs)
                 return result
             except Exception as e:
-                if attempt == self.max_retries - 1:
+                if attempt == self.max_retries - 1 or not _is_retryable(e):
                     raise e
-                print(f"API call failed (attempt {attempt + 1}/{self.max_retries}): {e}")
-                time.sleep(self.rate_limit_sleep_seconds * (attempt + 1))
+                log.warning("API call failed (attempt %d/%d): %s", attempt + 1, self.max_retries, e)
+                # Exponential backoff with full jitter so concurrent workers
+                # don't retry in lockstep
+                delay = min(self.max_backoff_seconds, self.rate_limit_sleep_seconds * 2 ** attempt)
+                time.sleep(random.uniform(0, delay))
+    
+    def _raw_result_set(self, endpoint_result: Any, index: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Return one raw result set (headers and rowSet) of an nba_api endpoint.
+        
+        nba_api parses the response once when the endpoint is constructed and
+        keeps the result sets on data_sets; those are read directly because
+        get_dict() would parse the response text a second time.
+        """
+        data_sets = getattr(endpoint_result, "data_sets", None)
+        if data_sets is not None:
+            if len(data_sets) <= index:
+                return None
+            data = data_sets[index].data
+            return {"headers": data["headers"], "rowSet": data["data"]}
+        
+        payload = endpoint_result.get_dict()
+        result_sets = payload.get("resultSets") or payload.get("resultSet") or []
+        if isinstance(result_sets, dict):
+            result_sets = [result_sets]
+        if len(result_sets) <= index:
+            return None
+        return result_sets[index]
+    
+    def _result_rows(self, endpoint_result: Any, index: int = 0) -> Tuple[Dict[str, int], List[List[Any]]]:
+        """Return the column positions by header and the raw rows of one result set."""
+        result_set = self._raw_result_set(endpoint_result, index)
+        if result_set is None:
+            return {}, []
+        return {header: i for i, header in enumerate(result_set["headers"])}, result_set["rowSet"]
+    
+    def _iter_result_rows(self, endpoint_result: Any, index: int = 0) -> Iterator[Dict[str, Any]]:
+        """Yield one raw result set of an nba_api endpoint as header-keyed dicts."""
+        result_set = self._raw_result_set(endpoint_result, index)
+        if result_set is None:
+            return
+        
+        headers = result_set["headers"]
+        for row in result_set["rowSet"]:
+            yield dict(zip(headers, row))
     
     def get_teams(self, season: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Get all NBA teams using static data."""
+        """
+        Get all NBA teams using static data.
+        
+        The dicts are cached and shared between calls; treat them as read-only.
+        """
         try:
             if teams is None:
-                print("Warning: Teams static data not available")
+                log.warning("Teams static data not available")
                 return []
-                
-            teams_data = teams.get_teams()
-            
-            teams_list = []
-            for team in teams_data:
-                team_dict = {
-                    "team_id": str(team['id']),
-                    "name": team['full_name'],
-                    "abbreviation": team['abbreviation'],
-                    "city": team['city'],
-                    "state": team['state'],
-                    "conference": team.get('conference', ''),
-                    "division": team.get('division', '')
-                }
-                teams_list.append(team_dict)
             
-            return teams_list
+            return list(_static_teams())
             
-        except Exception as e:
-            print(f"Error fetching teams: {e}")
+        except Exception:
+            log.exception("Error fetching teams")
             return []
     
+    def iter_players(self, season: Optional[int] = None, team_id: Optional[str] = None,
+                     page_size: int = 250) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield NBA players from static data in pages of at most page_size.
+        
+        With team_id, only that team's players are yielded. The dicts are
+        cached and shared between calls; treat them as read-only.
+        """
+        if players is None:
+            log.warning("Players static data not available")
+            return
+            
+        # Active players only if season is specified
+        if team_id:
+            players_data = _static_players_by_team(bool(season)).get(str(team_id), ())
+        else:
+            players_data = _static_players(bool(season))
+        for start in range(0, len(players_data), page_size):
+            yield list(players_data[start:start + page_size])
+    
     def get_players(self, season: Optional[int] = None, team_id: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get NBA players using static data."""
+        """Get NBA players using static data, optionally for one team."""
         try:
-            if players is None:
-                print("Warning: Players static data not available")
-                return []
-                
-            players_data = players.get_players()
-            
-            if season:
-                players_data = [p for p in players_data if p.get('is_active', False)]
-            
-            players_list = []
-            for player in players_data:
-                player_dict = {
-                    "player_id": str(player['id']),
-                    "name": player['full_name'],
-                    "first_name": player['first_name'],
-                    "last_name": player['last_name'],
-                    "position": player.get('position', ''),
-                    "height": player.get('height', ''),
-                    "weight": player.get('weight', 0),
-                    "is_active": player.get('is_active', False),
-                    "team_id": str(player.get('team_id', '')) if player.get('team_id') else None
-                }
-                players_list.append(player_dict)
+            return [player for page in self.iter_players(season, team_id) for player in page]
+            
+        except Exception:
+            log.exception("Error fetching players")
+            return []
+    
+    def get_team_roster(self, team_id: str, season: int) -> List[Dict[str, Any]]:
+        """Get a team's roster for a specific season."""
+        if not NBA_API_AVAILABLE:
+            log.warning("NBA API endpoints not available")
+            return []
+            
+        try:
+            from nba_api.stats.endpoints import commonteamroster
+            
+            roster_data = self._safe_api_call(
+                commonteamroster.CommonTeamRoster,
+                team_id=team_id,
+                season=_season_str(season)
+            )
             
-            return players_list
+            idx, rows = self._result_rows(roster_data)
+            roster = _convert_rows(rows, idx, ROSTER_SCHEMA, is_active=True)
             
-        except Exception as e:
-            print(f"Error fetching players: {e}")
+            return roster
+            
+        except Exception:
+            log.exception("Error fetching roster for team %s", team_id)
             return []
     
     def get_games(self, season: int, season_type: str = "Regular Season") -> List[Dict[str, Any]]:
         """Get NBA games for a specific season."""
         if not NBA_API_AVAILABLE:
-            print("Warning: NBA API endpoints not available")
+            log.warning("NBA API endpoints not available")
             return []
             
         try:
             # Use scoreboard endpoint for current games
+            from nba_api.stats.endpoints import scoreboard
+            
             scoreboard_data = self._safe_api_call(
                 scoreboard.ScoreBoard,
                 game_date=None,
@@ -141,212 +505,213 @@ class NBAAPIClientFixed:
                 day_offset=0
             )
             
-            games = []
-            if hasattr(scoreboard_data, 'get_data_frames'):
-                df = scoreboard_data.get_data_frames()[0]
-                
-                for _, row in df.iterrows():
-                    game_dict = {
-                        "game_id": str(row['GAME_ID']),
-                        "game_date": row['GAME_DATE_EST'],
-                        "season": season,
-                        "season_type": season_type,
-                        "home_team_abbr": row['HOME_TEAM_ABBREVIATION'],
-                        "away_team_abbr": row['VISITOR_TEAM_ABBREVIATION'],
-                        "home_score": int(row['HOME_TEAM_SCORE']) if pd.notna(row['HOME_TEAM_SCORE']) else 0,
-                        "away_score": int(row['VISITOR_TEAM_SCORE']) if pd.notna(row['VISITOR_TEAM_SCORE']) else 0,
-                        "home_win": False,  # Will be calculated
-                        "arena": row['ARENA'] if pd.notna(row['ARENA']) else "",
-                        "attendance": int(row['ATTENDANCE']) if pd.notna(row['ATTENDANCE']) else 0
-                    }
-                    
-                    # Calculate home win
-                    if pd.notna(row['HOME_TEAM_SCORE']) and pd.notna(row['VISITOR_TEAM_SCORE']):
-                        game_dict["home_win"] = game_dict["home_score"] > game_dict["away_score"]
-                    
-                    games.append(game_dict)
+            if not hasattr(scoreboard_data, 'get_data_frames'):
+                return []
             
-            return games
+            df = scoreboard_data.get_data_frames()[0]
+            home_scores = df['HOME_TEAM_SCORE'].to_numpy(dtype=float)
+            away_scores = df['VISITOR_TEAM_SCORE'].to_numpy(dtype=float)
             
-        except Exception as e:
-            print(f"Error fetching games: {e}")
+            # Unplayed games have no score; they stay None rather than 0-0 so
+            # they are not counted as finished, and home_win is only set once
+            # both scores are known
+            scored = ~(np.isnan(home_scores) | np.isnan(away_scores))
+            home_wins = np.where(scored, home_scores > away_scores, None).tolist()
+            
+            columns = zip(
+                df['GAME_ID'].tolist(),
+                df['GAME_DATE_EST'].tolist(),
+                df['HOME_TEAM_ABBREVIATION'].tolist(),
+                df['VISITOR_TEAM_ABBREVIATION'].tolist(),
+                _optional_ints(home_scores),
+                _optional_ints(away_scores),
+                home_wins,
+                df['ARENA'].fillna("").tolist(),
+                np.nan_to_num(df['ATTENDANCE'].to_numpy(dtype=float)).astype(int).tolist()
+            )
+            return [
+                {
+                    "game_id": str(game_id),
+                    "game_date": game_date,
+                    "season": season,
+                    "season_type": season_type,
+                    "home_team_abbr": home_abbr,
+                    "away_team_abbr": away_abbr,
+                    "home_score": home_score,
+                    "away_score": away_score,
+                    "home_win": home_win,
+                    "arena": arena,
+                    "attendance": attendance
+                }
+                for (game_id, game_date, home_abbr, away_abbr, home_score, away_score,
+                     home_win, arena, attendance) in columns
+            ]
+            
+        except Exception:
+            log.exception("Error fetching games")
             return []
     
-    def get_team_stats(self, season: int, season_type: str = "Regular Season") -> List[Dict[str, Any]]:
+    def _fetch_team_stats(self, season: int, season_type: str) -> Any:
+        """Call LeagueDashTeamStats for one season with per-game numbers."""
+        from nba_api.stats.endpoints import leaguedashteamstats
+        
+        return self._safe_api_call(
+            leaguedashteamstats.LeagueDashTeamStats,
+            season=_season_str(season),
+            season_type_all_star=season_type,
+            per_mode_detailed="PerGame"
+        )
+    
+    def _fetch_player_stats(self, season: int, season_type: str,
+                            team_id: Optional[str] = None) -> Any:
+        """Call LeagueDashPlayerStats for one season (and team) with per-game numbers."""
+        from nba_api.stats.endpoints import leaguedashplayerstats
+        
+        return self._safe_api_call(
+            leaguedashplayerstats.LeagueDashPlayerStats,
+            season=_season_str(season),
+            season_type_all_star=season_type,
+            per_mode_detailed="PerGame",
+            team_id_nullable=team_id or ""
+        )
+    
+    def iter_team_stats(self, season: int, season_type: str = "Regular Season",
+                        force_refresh: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Yield raw team statistics rows for a season.
+        
+        Rows are keyed by the API's own headers (TEAM_ID, GP, W_PCT, ...) and
+        built one at a time from the response instead of through a DataFrame.
+        """
+        if not NBA_API_AVAILABLE:
+            log.warning("NBA API endpoints not available")
+            return
+            
+        try:
+            if force_refresh:
+                drop_cached_responses("leaguedashteamstats")
+            
+            stats_data = self._fetch_team_stats(season, season_type)
+        except Exception:
+            log.exception("Error fetching team stats")
+            return
+        
+        yield from self._iter_result_rows(stats_data)
+    
+    def get_team_stats(self, season: int, season_type: str = "Regular Season",
+                       force_refresh: bool = False) -> List[Dict[str, Any]]:
         """Get team statistics for a specific season."""
         if not NBA_API_AVAILABLE:
-            print("Warning: NBA API endpoints not available")
+            log.warning("NBA API endpoints not available")
             return []
             
         try:
-            stats_data = self._safe_api_call(
-                leaguedashteamstats.LeagueDashTeamStats,
-                season=f"{season}-{str(season + 1)[-2:]}",
-                season_type_all_star=season_type,
-                per_mode_detailed="PerGame"
-            )
+            if force_refresh:
+                drop_cached_responses("leaguedashteamstats")
             
-            stats = []
-            if hasattr(stats_data, 'get_data_frames'):
-                df = stats_data.get_data_frames()[0]
-                
-                for _, row in df.iterrows():
-                    stat_dict = {
-                        "team_id": str(row['TEAM_ID']),
-                        "team_name": row['TEAM_NAME'],
-                        "season": season,
-                        "season_type": season_type,
-                        "games_played": int(row['GP']) if pd.notna(row['GP']) else 0,
-                        "wins": int(row['W']) if pd.notna(row['W']) else 0,
-                        "losses": int(row['L']) if pd.notna(row['L']) else 0,
-                        "win_percentage": float(row['W_PCT']) if pd.notna(row['W_PCT']) else 0.0,
-                        "points_per_game": float(row['PTS']) if pd.notna(row['PTS']) else 0.0,
-                        "rebounds_per_game": float(row['REB']) if pd.notna(row['REB']) else 0.0,
-                        "assists_per_game": float(row['AST']) if pd.notna(row['AST']) else 0.0,
-                        "steals_per_game": float(row['STL']) if pd.notna(row['STL']) else 0.0,
-                        "blocks_per_game": float(row['BLK']) if pd.notna(row['BLK']) else 0.0,
-                        "turnovers_per_game": float(row['TOV']) if pd.notna(row['TOV']) else 0.0,
-                        "field_goal_percentage": float(row['FG_PCT']) if pd.notna(row['FG_PCT']) else 0.0,
-                        "three_point_percentage": float(row['FG3_PCT']) if pd.notna(row['FG3_PCT']) else 0.0,
-                        "free_throw_percentage": float(row['FT_PCT']) if pd.notna(row['FT_PCT']) else 0.0
-                    }
-                    stats.append(stat_dict)
-            
-            return stats
-            
-        except Exception as e:
-            print(f"Error fetching team stats: {e}")
+            stats_data = self._fetch_team_stats(season, season_type)
+            
+            idx, rows = self._result_rows(stats_data)
+            return _convert_rows(rows, idx, TEAM_STATS_SCHEMA,
+                                 season=season, season_type=season_type)
+            
+        except Exception:
+            log.exception("Error fetching team stats")
             return []
     
-    def get_player_stats(self, season: int, season_type: str = "Regular Season") -> List[Dict[str, Any]]:
-        """Get player statistics for a specific season."""
+    def iter_player_stats(self, season: int, season_type: str = "Regular Season",
+                          team_id: Optional[str] = None,
+                          force_refresh: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Yield raw player statistics rows for a season, optionally for one team.
+        
+        Rows are keyed by the API's own headers (PLAYER_ID, TEAM_ID, GP, ...)
+        and built one at a time from the response instead of through a
+        DataFrame.
+        """
         if not NBA_API_AVAILABLE:
-            print("Warning: NBA API endpoints not available")
+            log.warning("NBA API endpoints not available")
+            return
+            
+        try:
+            if force_refresh:
+                drop_cached_responses("leaguedashplayerstats")
+            
+            stats_data = self._fetch_player_stats(season, season_type, team_id)
+        except Exception:
+            log.exception("Error fetching player stats")
+            return
+        
+        yield from self._iter_result_rows(stats_data)
+    
+    def get_player_stats(self, season: int, season_type: str = "Regular Season",
+                         team_id: Optional[str] = None,
+                         force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """Get player statistics for a specific season, optionally for one team."""
+        if not NBA_API_AVAILABLE:
+            log.warning("NBA API endpoints not available")
             return []
             
         try:
-            stats_data = self._safe_api_call(
-                leaguedashplayerstats.LeagueDashPlayerStats,
-                season=f"{season}-{str(season + 1)[-2:]}",
-                season_type_all_star=season_type,
-                per_mode_detailed="PerGame"
-            )
+            if force_refresh:
+                drop_cached_responses("leaguedashplayerstats")
             
-            stats = []
-            if hasattr(stats_data, 'get_data_frames'):
-                df = stats_data.get_data_frames()[0]
-                
-                for _, row in df.iterrows():
-                    stat_dict = {
-                        "player_id": str(row['PLAYER_ID']),
-                        "player_name": row['PLAYER_NAME'],
-                        "team_id": str(row['TEAM_ID']) if pd.notna(row['TEAM_ID']) else None,
-                        "team_name": row['TEAM_NAME'] if pd.notna(row['TEAM_NAME']) else "",
-                        "season": season,
-                        "season_type": season_type,
-                        "games_played": int(row['GP']) if pd.notna(row['GP']) else 0,
-                        "games_started": int(row['GS']) if pd.notna(row['GS']) else 0,
-                        "minutes_per_game": float(row['MIN']) if pd.notna(row['MIN']) else 0.0,
-                        "points_per_game": float(row['PTS']) if pd.notna(row['PTS']) else 0.0,
-                        "rebounds_per_game": float(row['REB']) if pd.notna(row['REB']) else 0.0,
-                        "assists_per_game": float(row['AST']) if pd.notna(row['AST']) else 0.0,
-                        "steals_per_game": float(row['STL']) if pd.notna(row['STL']) else 0.0,
-                        "blocks_per_game": float(row['BLK']) if pd.notna(row['BLK']) else 0.0,
-                        "turnovers_per_game": float(row['TOV']) if pd.notna(row['TOV']) else 0.0,
-                        "field_goal_percentage": float(row['FG_PCT']) if pd.notna(row['FG_PCT']) else 0.0,
-                        "three_point_percentage": float(row['FG3_PCT']) if pd.notna(row['FG3_PCT']) else 0.0,
-                        "free_throw_percentage": float(row['FT_PCT']) if pd.notna(row['FT_PCT']) else 0.0
-                    }
-                    stats.append(stat_dict)
-            
-            return stats
-            
-        except Exception as e:
-            print(f"Error fetching player stats: {e}")
+            stats_data = self._fetch_player_stats(season, season_type, team_id)
+            
+            idx, rows = self._result_rows(stats_data)
+            return _convert_rows(rows, idx, PLAYER_STATS_SCHEMA,
+                                 season=season, season_type=season_type)
+            
+        except Exception:
+            log.exception("Error fetching player stats")
             return []
     
     def get_standings(self, season: int, season_type: str = "Regular Season") -> List[Dict[str, Any]]:
         """Get NBA standings for a specific season."""
         try:
+            from nba_api.stats.endpoints import leaguestandingsv3
+            
             standings_data = self._safe_api_call(
                 leaguestandingsv3.LeagueStandingsV3,
-                season=f"{season}-{str(season + 1)[-2:]}",
+                season=_season_str(season),
                 season_type=season_type
             )
             
-            standings = []
-            if hasattr(standings_data, 'get_data_frames'):
-                df = standings_data.get_data_frames()[0]
-                
-                for _, row in df.iterrows():
-                    standing_dict = {
-                        "team_id": str(row['TeamID']),
-                        "team_name": row['TeamName'],
-                        "season": season,
-                        "season_type": season_type,
-                        "conference": row['Conference'],
-                        "division": row['Division'],
-                        "wins": int(row['WINS']) if pd.notna(row['WINS']) else 0,
-                        "losses": int(row['LOSSES']) if pd.notna(row['LOSSES']) else 0,
-                        "win_percentage": float(row['WinPCT']) if pd.notna(row['WinPCT']) else 0.0,
-                        "games_back": float(row['GB']) if pd.notna(row['GB']) else 0.0,
-                        "conference_rank": int(row['ConferenceRank']) if pd.notna(row['ConferenceRank']) else 0,
-                        "division_rank": int(row['DivisionRank']) if pd.notna(row['DivisionRank']) else 0
-                    }
-                    standings.append(standing_dict)
-            
-            return standings
-            
-        except Exception as e:
-            print(f"Error fetching standings: {e}")
+            idx, rows = self._result_rows(standings_data)
+            return _convert_rows(rows, idx, STANDINGS_SCHEMA,
+                                 season=season, season_type=season_type)
+            
+        except Exception:
+            log.exception("Error fetching standings")
             return []
     
     def get_player_career_stats(self, player_id: str) -> Dict[str, Any]:
         """Get career statistics for a specific player."""
         try:
+            from nba_api.stats.endpoints import playercareerstats
+            
             career_data = self._safe_api_call(
                 playercareerstats.PlayerCareerStats,
                 player_id=player_id
             )
             
-            if hasattr(career_data, 'get_data_frames'):
-                df = career_data.get_data_frames()[0]
-                
-                career_stats = []
-                for _, row in df.iterrows():
-                    season_stats = {
-                        "season": row['SEASON_ID'],
-                        "team_id": str(row['TEAM_ID']) if pd.notna(row['TEAM_ID']) else None,
-                        "team_name": row['TEAM_NAME'] if pd.notna(row['TEAM_NAME']) else None,
-                        "games_played": int(row['GP']) if pd.notna(row['GP']) else 0,
-                        "games_started": int(row['GS']) if pd.notna(row['GS']) else 0,
-                        "minutes_per_game": float(row['MIN']) if pd.notna(row['MIN']) else 0.0,
-                        "points_per_game": float(row['PTS']) if pd.notna(row['PTS']) else 0.0,
-                        "rebounds_per_game": float(row['REB']) if pd.notna(row['REB']) else 0.0,
-                        "assists_per_game": float(row['AST']) if pd.notna(row['AST']) else 0.0,
-                        "steals_per_game": float(row['STL']) if pd.notna(row['STL']) else 0.0,
-                        "blocks_per_game": float(row['BLK']) if pd.notna(row['BLK']) else 0.0,
-                        "turnovers_per_game": float(row['TOV']) if pd.notna(row['TOV']) else 0.0,
-                        "field_goal_percentage": float(row['FG_PCT']) if pd.notna(row['FG_PCT']) else 0.0,
-                        "three_point_percentage": float(row['FG3_PCT']) if pd.notna(row['FG3_PCT']) else 0.0,
-                        "free_throw_percentage": float(row['FT_PCT']) if pd.notna(row['FT_PCT']) else 0.0
-                    }
-                    career_stats.append(season_stats)
-                
-                return {
-                    "player_id": player_id,
-                    "career_stats": career_stats
-                }
+            idx, rows = self._result_rows(career_data)
+            career_stats = _convert_rows(rows, idx, CAREER_STATS_SCHEMA)
             
-            return {"player_id": player_id, "career_stats": []}
+            return {
+                "player_id": player_id,
+                "career_stats": career_stats
+            }
             
-        except Exception as e:
-            print(f"Error fetching player career stats: {e}")
+        except Exception:
+            log.exception("Error fetching player career stats")
             return {"player_id": player_id, "career_stats": []}
     
     def get_live_games(self) -> List[Dict[str, Any]]:
         """Get currently live NBA games."""
         try:
+            from nba_api.live.nba.endpoints import scoreboard as live_scoreboard
+            
             live_data = self._safe_api_call(live_scoreboard.ScoreBoard)
             
             games = []
@@ -369,6 +734,25 @@ class NBAAPIClientFixed:
             
             return games
             
-        except Exception as e:
-            print(f"Error fetching live games: {e}")
+        except Exception:
+            log.exception("Error fetching live games")
             return []
+
+
+@lru_cache(maxsize=1)
+def get_client() -> NBAAPIClientFixed:
+    """Return the API client shared by every ingest in this process."""
+    return NBAAPIClientFixed()
+
+
+def clear_client() -> None:
+    """
+    Drop the shared client and its HTTP session.
+    
+    The next get_client() call builds both from scratch, e.g. to start over
+    on fresh connections after stats.nba.com begins throttling.
+    """
+    get_client.cache_clear()
+    if get_http_session.cache_info().currsize:
+        get_http_session().close()
+    get_http_session.cache_clear()
@@ -0,0 +1,35 @@
+"""
+Shared fixtures for the automated test suite
+"""
+
+import os
+
+# Anything that reaches the process-wide engine gets a throwaway database
+# instead of the project's nba.sqlite3
+os.environ["DATABASE_URL"] = "sqlite://"
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from nba.db.models import Base, Team
+
+
+@pytest.fixture
+def session():
+    """Session on a fresh in-memory SQLite database with every table created."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def teams(session):
+    """Two committed teams, AAA (id 1) and BBB (id 2)."""
+    session.add_all([
+        Team(id=1, team_id="1", name="Team A", abbreviation="AAA"),
+        Team(id=2, team_id="2", name="Team B", abbreviation="BBB"),
+    ])
+    session.commit()
@@ -0,0 +1,154 @@
+"""
+Tests for the NBA API clients' result-set converters and retry policy
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+
+from nba.sources import nba_api_client_fixed
+from nba.sources.nba_api_client import CAREER_STATS_COLUMNS, _frame_records
+from nba.sources.nba_api_client_fixed import (
+    PLAYER_STATS_SCHEMA, ROSTER_SCHEMA, NBAAPIClientFixed, _convert_rows, _is_retryable,
+    _optional_ints,
+)
+
+
+def _index(headers):
+    return {header: i for i, header in enumerate(headers)}
+
+
+def test_convert_rows_fills_missing_numbers_and_constants():
+    headers = ["PLAYER_ID", "PLAYER_NAME", "TEAM_ID", "TEAM_NAME", "GP", "GS", "MIN", "PTS",
+               "REB", "AST", "STL", "BLK", "TOV", "FG_PCT", "FG3_PCT", "FT_PCT"]
+    rows = [
+        [101, "A", 1, "Team A", 10, 5, 30.5, 20.1, 5, 4, 1, 0.5, 2, 0.5, 0.4, 0.8],
+        [102, "B", None, None, None, None, None, None, None, None, None, None, None, None, None, None],
+    ]
+    
+    converted = _convert_rows(rows, _index(headers), PLAYER_STATS_SCHEMA,
+                              season=2023, season_type="Playoffs")
+    
+    assert [key for key, _, _ in PLAYER_STATS_SCHEMA] == list(converted[0])
+    assert converted[0]["player_id"] == "101"
+    assert converted[0]["team_id"] == "1"
+    assert converted[0]["games_played"] == 10
+    assert converted[0]["points_per_game"] == 20.1
+    assert converted[1]["team_id"] is None
+    assert converted[1]["team_name"] == ""
+    assert converted[1]["games_played"] == 0
+    assert converted[1]["field_goal_percentage"] == 0.0
+    assert all(row["season"] == 2023 and row["season_type"] == "Playoffs" for row in converted)
+
+
+def test_convert_rows_handles_an_empty_result_set():
+    assert _convert_rows([], {}, PLAYER_STATS_SCHEMA, season=2023, season_type="Playoffs") == []
+
+
+def test_roster_rows_parse_birth_dates_and_default_blanks():
+    headers = ["TeamID", "PLAYER", "NUM", "POSITION", "HEIGHT", "WEIGHT", "BIRTH_DATE",
+               "SCHOOL", "PLAYER_ID"]
+    rows = [
+        [1610612737, "Trae Young", "11", "G", "6-1", "164", "SEP 19, 1998", "Oklahoma", 1629027],
+        [1610612737, "X Y", None, None, None, None, None, None, 5],
+    ]
+    
+    first, second = _convert_rows(rows, _index(headers), ROSTER_SCHEMA, is_active=True)
+    
+    assert first == {
+        "player_id": "1629027", "name": "Trae Young", "position": "G", "height": "6-1",
+        "weight": "164", "birth_date": "1998-09-19", "college": "Oklahoma",
+        "jersey_number": "11", "is_active": True, "team_id": "1610612737",
+    }
+    assert (second["position"], second["height"], second["weight"]) == ("", "", 0)
+    assert (second["birth_date"], second["college"], second["jersey_number"]) == (None, None, None)
+
+
+def test_result_rows_read_nba_api_data_sets():
+    class DataSet:
+        def __init__(self, data):
+            self.data = data
+    
+    class Endpoint:
+        data_sets = [DataSet({"headers": ["A", "B"], "data": [[1, 2]]})]
+    
+    client = NBAAPIClientFixed.__new__(NBAAPIClientFixed)
+    
+    assert client._result_rows(Endpoint()) == ({"A": 0, "B": 1}, [[1, 2]])
+    assert client._result_rows(Endpoint(), 1) == ({}, [])
+
+
+def test_optional_ints_keeps_missing_scores_as_none():
+    assert _optional_ints(np.array([101.0, np.nan, 0.0])) == [101, None, 0]
+
+
+def test_frame_records_casts_columns_and_fills_missing():
+    df = pd.DataFrame({
+        "SEASON_ID": ["2022-23", "2023-24"],
+        "TEAM_ID": [1610612737, 1610612738],
+        "TEAM_NAME": ["ATL", None],
+        "GP": [82, None],
+        "GS": [80, 3],
+        "MIN": [35.1, None],
+        **{column: [1.0, None] for _, (column, dtype, _) in CAREER_STATS_COLUMNS.items()
+           if column not in ("SEASON_ID", "TEAM_ID", "TEAM_NAME", "GP", "GS", "MIN")},
+    })
+    
+    first, second = _frame_records(df, CAREER_STATS_COLUMNS)
+    
+    assert first["team_id"] == "1610612737"
+    assert first["games_played"] == 82 and type(first["games_played"]) is int
+    assert second["team_id"] == "1610612738"
+    assert second["team_name"] is None
+    assert second["games_played"] == 0
+    assert second["minutes_per_game"] == 0.0
+
+
+def _http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.HTTPError(response=response)
+
+
+@pytest.mark.parametrize("status_code, retryable", [
+    (429, True), (500, True), (502, True), (503, True), (504, True),
+    (400, False), (404, False),
+])
+def test_is_retryable_by_status(status_code, retryable):
+    assert _is_retryable(_http_error(status_code)) is retryable
+
+
+def test_errors_without_a_response_are_retryable():
+    assert _is_retryable(requests.ConnectionError("reset"))
+    assert _is_retryable(TimeoutError())
+
+
+def test_safe_api_call_retries_throttling_then_gives_up(monkeypatch):
+    monkeypatch.setattr(nba_api_client_fixed.time, "sleep", lambda seconds: None)
+    client = NBAAPIClientFixed(max_retries=3)
+    monkeypatch.setattr(client, "_rate_limit", lambda: None)
+    calls = []
+    
+    def throttled():
+        calls.append(1)
+        raise _http_error(429)
+    
+    with pytest.raises(requests.HTTPError):
+        client._safe_api_call(throttled)
+    assert len(calls) == 3
+
+
+def test_safe_api_call_does_not_retry_client_errors(monkeypatch):
+    monkeypatch.setattr(nba_api_client_fixed.time, "sleep", lambda seconds: None)
+    client = NBAAPIClientFixed(max_retries=3)
+    monkeypatch.setattr(client, "_rate_limit", lambda: None)
+    calls = []
+    
+    def not_found():
+        calls.append(1)
+        raise _http_error(404)
+    
+    with pytest.raises(requests.HTTPError):
+        client._safe_api_call(not_found)
+    assert len(calls) == 1
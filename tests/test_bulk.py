@@ -0,0 +1,75 @@
+"""
+Tests for nba.db.bulk.upsert_rows
+"""
+
+from sqlalchemy import select, text
+
+from nba.db.bulk import upsert_rows
+from nba.db.models import Team
+
+
+def _teams(session):
+    return session.execute(
+        select(Team.team_id, Team.name, Team.city).order_by(Team.team_id)
+    ).all()
+
+
+def _total_changes(session) -> int:
+    return session.execute(text("SELECT total_changes()")).scalar_one()
+
+
+def test_inserts_new_rows_and_updates_existing(session):
+    upsert_rows(session, Team, [{"team_id": "1", "name": "A", "city": "X"}],
+                index_elements=["team_id"])
+    upsert_rows(session, Team, [
+        {"team_id": "1", "name": "A2", "city": "Y"},
+        {"team_id": "2", "name": "B", "city": "Z"},
+    ], index_elements=["team_id"])
+    
+    assert _teams(session) == [("1", "A2", "Y"), ("2", "B", "Z")]
+
+
+def test_null_overwrites_by_default(session):
+    upsert_rows(session, Team, [{"team_id": "1", "name": "A", "city": "X"}],
+                index_elements=["team_id"])
+    upsert_rows(session, Team, [{"team_id": "1", "name": "A", "city": None}],
+                index_elements=["team_id"])
+    
+    assert _teams(session) == [("1", "A", None)]
+
+
+def test_keep_existing_on_null_keeps_stored_value(session):
+    upsert_rows(session, Team, [{"team_id": "1", "name": "A", "city": "X"}],
+                index_elements=["team_id"])
+    upsert_rows(session, Team, [{"team_id": "1", "name": "A2", "city": None}],
+                index_elements=["team_id"], keep_existing_on_null=True)
+    
+    assert _teams(session) == [("1", "A2", "X")]
+
+
+def test_update_columns_limits_what_is_overwritten(session):
+    upsert_rows(session, Team, [{"team_id": "1", "name": "A", "city": "X"}],
+                index_elements=["team_id"])
+    upsert_rows(session, Team, [{"team_id": "1", "name": "A2", "city": "Y"}],
+                index_elements=["team_id"], update_columns=["name"])
+    
+    assert _teams(session) == [("1", "A2", "X")]
+
+
+def test_skip_unchanged_does_not_rewrite_identical_rows(session):
+    rows = [{"team_id": "1", "name": "A", "city": "X"}, {"team_id": "2", "name": "B", "city": "Y"}]
+    upsert_rows(session, Team, rows, index_elements=["team_id"])
+    
+    before = _total_changes(session)
+    upsert_rows(session, Team, [{**rows[0]}, {**rows[1], "city": "Z"}],
+                index_elements=["team_id"], skip_unchanged=True)
+    
+    # Only the changed row is written
+    assert _total_changes(session) - before == 1
+    assert _teams(session) == [("1", "A", "X"), ("2", "B", "Z")]
+
+
+def test_empty_rows_is_a_no_op(session):
+    upsert_rows(session, Team, [], index_elements=["team_id"])
+    
+    assert _teams(session) == []
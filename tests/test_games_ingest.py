@@ -0,0 +1,100 @@
+"""
+Tests for game ingestion and the team season summary roll-up
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from nba.db.models import Game, TeamSeasonSummary
+from nba.ingest import games_ingest
+from nba.ingest.games_ingest import ingest_games, refresh_team_season_summary
+
+
+def _game(game_id, home_score, away_score, home="AAA", away="BBB"):
+    return {
+        "game_id": str(game_id),
+        "game_date": f"2023-10-{20 + game_id:02d}",
+        "home_team_abbr": home,
+        "away_team_abbr": away,
+        "home_score": home_score,
+        "away_score": away_score,
+    }
+
+
+class _FakeClient:
+    def __init__(self, games):
+        self.games = games
+    
+    def get_games(self, season, season_type="Regular Season"):
+        return self.games
+
+
+@pytest.fixture
+def ingest(session, teams, monkeypatch):
+    """Ingest the given API games for 2023 into the test session."""
+    def run(games):
+        monkeypatch.setattr(games_ingest, "get_client", lambda: _FakeClient(games))
+        ingest_games(2023, session=session)
+        session.commit()
+    return run
+
+
+def _summary(session):
+    return session.execute(
+        select(
+            TeamSeasonSummary.team_id,
+            TeamSeasonSummary.games_played,
+            TeamSeasonSummary.wins,
+            TeamSeasonSummary.losses,
+            TeamSeasonSummary.home_wins,
+            TeamSeasonSummary.away_wins,
+        ).order_by(TeamSeasonSummary.team_id)
+    ).all()
+
+
+def test_summary_counts_finished_games(session, ingest):
+    ingest([_game(1, 110, 100), _game(2, 95, 105, home="BBB", away="AAA")])
+    
+    # AAA won at home and away; BBB lost both
+    assert _summary(session) == [(1, 2, 2, 0, 1, 1), (2, 2, 0, 2, 0, 0)]
+    points = session.execute(
+        select(TeamSeasonSummary.points_per_game).where(TeamSeasonSummary.team_id == 1)
+    ).scalar_one()
+    assert points == pytest.approx(107.5)
+
+
+@pytest.mark.parametrize("home_score, away_score", [(None, None), (0, 0)])
+def test_unplayed_game_is_not_counted(session, ingest, home_score, away_score):
+    ingest([_game(1, 110, 100), _game(2, home_score, away_score)])
+    
+    assert _summary(session) == [(1, 1, 1, 0, 1, 0), (2, 1, 0, 1, 0, 0)]
+
+
+@pytest.mark.parametrize("home_score, away_score", [(None, None), (0, 0)])
+def test_unplayed_game_has_null_scores_and_home_win(session, ingest, home_score, away_score):
+    ingest([_game(1, home_score, away_score)])
+    
+    row = session.execute(select(Game.home_score, Game.away_score, Game.home_win)).one()
+    assert tuple(row) == (None, None, None)
+
+
+def test_home_win_is_generated_from_scores(session, ingest):
+    ingest([_game(1, 110, 100), _game(2, 90, 100)])
+    
+    home_wins = session.execute(select(Game.id, Game.home_win).order_by(Game.id)).all()
+    assert home_wins == [(1, True), (2, False)]
+
+
+def test_refresh_replaces_previous_summary(session, teams):
+    session.add(Game(id=1, season=2023, season_type="Regular Season", game_date=date(2023, 10, 24),
+                     home_team_id=1, away_team_id=2, home_team_abbr="AAA", away_team_abbr="BBB",
+                     home_score=100, away_score=90))
+    refresh_team_season_summary(2023, "Regular Season", session)
+    
+    session.get(Game, 1).away_score = 120
+    session.flush()
+    refresh_team_season_summary(2023, "Regular Season", session)
+    
+    assert _summary(session) == [(1, 1, 0, 1, 0, 0), (2, 1, 1, 0, 0, 1)]
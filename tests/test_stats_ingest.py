@@ -0,0 +1,51 @@
+"""
+Tests for the stats ingest converters
+"""
+
+import math
+
+import pytest
+
+from nba.ingest.stats_ingest import (
+    PLAYER_STATS_FIELDS, TEAM_STATS_FIELDS, player_stats_mapping_from_data, safe_float,
+    safe_int, team_stats_mapping_from_data,
+)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (3, 3.0), (2.5, 2.5), ("1.5", 1.5), (None, None), ("", None), ("n/a", None),
+])
+def test_safe_float(value, expected):
+    assert safe_float(value) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    (3, 3), (2.9, 2), ("7", 7), (None, None), ("", None), (math.nan, None), (math.inf, None),
+])
+def test_safe_int(value, expected):
+    assert safe_int(value) == expected
+
+
+def test_team_stats_mapping_converts_every_field():
+    mapping = team_stats_mapping_from_data(
+        {"GP": 82, "W": "50", "PTS": 110.5, "FG_PCT": "bad"}, 7, 2023, "Regular Season"
+    )
+    
+    assert list(mapping) == [attr for attr, _, _ in TEAM_STATS_FIELDS] + ["team_id", "season", "season_type"]
+    assert mapping["games_played"] == 82
+    assert mapping["wins"] == 50
+    assert mapping["points_per_game"] == 110.5
+    assert mapping["field_goal_percentage"] is None
+    assert mapping["losses"] is None
+    assert (mapping["team_id"], mapping["season"], mapping["season_type"]) == (7, 2023, "Regular Season")
+
+
+def test_player_stats_mapping_keeps_context_columns():
+    mapping = player_stats_mapping_from_data({"GP": 10, "MIN": "31.5"}, 3, None, 2023, "Playoffs")
+    
+    assert set(mapping) == {attr for attr, _, _ in PLAYER_STATS_FIELDS} | {
+        "player_id", "team_id", "season", "season_type"
+    }
+    assert mapping["games_played"] == 10
+    assert mapping["minutes_per_game"] == 31.5
+    assert (mapping["player_id"], mapping["team_id"]) == (3, None)